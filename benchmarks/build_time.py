@@ -0,0 +1,77 @@
+# Measures the cost of creating Kisa classes.
+#
+# Usage: python3 benchmarks/build_time.py [classes] [runs]
+#
+# Each run creates the given amount of classes, by class statements and by
+# kisa.make_class(). The best run is reported per class, with the garbage
+# collector disabled (the generation itself) and enabled.
+# NOTE: Kisa keeps the created classes registered, so the heap grows between runs.
+
+import gc
+import os
+import sys
+import time
+
+PROJECT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_PATH, "src"))
+
+import kisa  # noqa: E402
+
+FIELDS_AMOUNT = 5
+
+
+def build_by_statement(index):
+    class Record(metaclass=kisa.Class):
+        f0 = kisa.Info(type=int)
+        f1 = kisa.Info(type=str, default="")
+        f2 = kisa.Info(type=float, default=0.0)
+        f3 = kisa.Info(type=list, default=lambda: [])
+        f4 = kisa.Info(type="Record", required=False)
+
+        def describe(self):
+            return f"{self.f0()}: {self.f1()}"
+
+    return Record
+
+
+def build_by_make_class(index):
+    return kisa.make_class(f"Record{index}",
+                           fields={"f0": int,
+                                   "f1": {"type": str, "default": ""},
+                                   "f2": {"type": float, "default": 0.0},
+                                   "f3": {"type": list, "default": lambda: []},
+                                   "f4": {"type": f"Record{index}", "required": False}},
+                           methods={"describe": lambda self: f"{self.f0()}: {self.f1()}"})
+
+
+def measure_build(build, classes_amount, gc_enabled):
+    gc.collect()
+    if not gc_enabled:
+        gc.disable()
+    try:
+        start = time.perf_counter()
+        created = [build(index) for index in range(classes_amount)]
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+
+    del created
+    gc.collect()
+    return elapsed / classes_amount * 1e6
+
+
+def main():
+    classes_amount = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    print(f"class build: {classes_amount} classes, {FIELDS_AMOUNT} attributes each (best of {runs})")
+    for name, build in (("class statement", build_by_statement), ("make_class", build_by_make_class)):
+        for gc_enabled in (False, True):
+            # Warm up
+            measure_build(build, classes_amount // 10 or 1, gc_enabled)
+            best_us = min(measure_build(build, classes_amount, gc_enabled) for _ in range(runs))
+            print(f"    {name:<16} gc {'on ' if gc_enabled else 'off'} {best_us:>8.1f} us/class")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Measures the cost of "import kisa" using "python -X importtime".
+#
+# Usage: python3 benchmarks/import_time.py [runs]
+#
+# Each run imports kisa in a fresh interpreter, the best run is reported
+# along with the modules kisa imports directly.
+
+import os
+import subprocess
+import sys
+
+PROJECT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_PATH = os.path.join(PROJECT_PATH, "src")
+
+
+def measure_import():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = SOURCE_PATH
+    # Measure the usual import, from cached bytecode
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import kisa"],
+                            env=env,
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=True)
+
+    # Lines are formatted as: "import time: <self us> | <cumulative us> | <indented name>"
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+
+    # Children are reported before their parent
+    kisa_index = next(index for index, imported in enumerate(imports)
+                      if imported[0] == "kisa")
+    kisa_depth = imports[kisa_index][1]
+    children = []
+    for name, depth, _self_us, cumulative_us in reversed(imports[:kisa_index]):
+        if depth <= kisa_depth:
+            break
+        if depth == kisa_depth + 1:
+            children.append((name, cumulative_us))
+
+    return imports[kisa_index][3], children
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    # Warm up, caches the bytecode if needed
+    measure_import()
+    best_us, best_children = min((measure_import() for _ in range(runs)),
+                                 key=lambda measure: measure[0])
+
+    print(f"import kisa: {best_us} us (best of {runs})")
+    for name, cumulative_us in sorted(best_children, key=lambda child: -child[1]):
+        print(f"    {name:<24} {cumulative_us:>8} us")
+
+
+if __name__ == "__main__":
+    main()
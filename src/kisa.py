@@ -1,9 +1,22 @@
 
-import re
-import inspect
-import pydoc
-
-from typing import Callable, Dict, List, AbstractSet, MutableSet, Union
+# NOTE: inspect/pydoc/random/bisect are imported only by the code paths requiring them,
+#       since they are expensive to import
+import collections
+import collections.abc
+import itertools
+import operator
+import os
+import sys
+import threading
+import time
+import types
+import typing
+import weakref
+
+from typing import Any, Callable, Dict, ForwardRef, List, AbstractSet, MutableSet, TypeVar, Union
+
+# Same as inspect.CO_VARARGS
+_CO_VARARGS = 0x04
 
 
 class _AbstractMethod(object):
@@ -11,8 +24,10 @@ class _AbstractMethod(object):
 
 
 class _AttributeModifier(object):
-    def __init__(self, gen_callback: Callable, name: Union[str, List[str]]):
+    def __init__(self, gen_callback: Callable, name: Union[str, List[str]], callback: Callable = None):
         self.gen_callback: Callable[[Info], Callable] = gen_callback
+        # The user function, when used as the modifier as is (None if generated from it)
+        self.callback: Callable = callback
         if isinstance(name, str):
             name = [name]
         self.modified_attributes: List[str] = name
@@ -35,14 +50,32 @@ class _StaticClass(object):
         self.callback: Callable = callback
 
 
+class _MemoizedMethod(object):
+    def __init__(self, callback: Callable, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise Exception(f"Memoize maxsize must be positive, got {maxsize}")
+        self.callback: Callable = callback
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def stats(self) -> Dict[str, any]:
+        calls = self.hits + self.misses
+        return {"maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / calls if calls > 0 else 0.0}
+
+
 class ModifiersList():
     def __init__(self, before=None, around=None, after=None, static=False) -> None:
+        # NOTE: Most attributes have no modifiers, so they share an empty tuple until added
         if before is None:
-            before = []
+            before = ()
         if around is None:
-            around = []
+            around = ()
         if after is None:
-            after = []
+            after = ()
 
         self.before: List[_AttributeModifier] = before
         self.around: List[_AttributeModifier] = around
@@ -51,13 +84,16 @@ class ModifiersList():
         self.static: bool = static
 
     def add_before(self, callback: _AttributeModifier):
-        self.before.append(callback)
+        self.before = [*self.before, callback]
 
     def add_around(self, callback: _AttributeModifier):
-        self.around.append(callback)
+        self.around = [*self.around, callback]
 
     def add_after(self, callback: _AttributeModifier):
-        self.after.append(callback)
+        self.after = [*self.after, callback]
+
+    def has_modifiers(self) -> bool:
+        return len(self.before) > 0 or len(self.around) > 0 or len(self.after) > 0
 
 
 class Info(ModifiersList):
@@ -68,14 +104,20 @@ class Info(ModifiersList):
                  final: bool = False,
                  allow_none: bool = True,
                  lazy: bool = False,
+                 check_items: Union[str, int] = "full",
+                 check_depth: int = None,
+                 index: Union[bool, str] = False,
+                 evictable: bool = False,
                  before: None = None,
                  around=None,
                  after=None,
                  _static=False,
+                 _computed=False,
+                 _capture_frame=True,
                  _name=None) -> None:
 
         super().__init__(before=before, around=around, after=after, static=_static)
-        if default is not None or lazy is True:
+        if default is not None or lazy is True or _computed is True:
             self.required: bool = False
         else:
             self.required: bool = required
@@ -83,12 +125,53 @@ class Info(ModifiersList):
         self.final: bool = final
         self.allow_none = allow_none
         self.lazy = lazy
+        self.computed: bool = _computed
         self._name: str = _name
 
-        self._in_module = self._get_outer_module_name()
-        self._current_frame = self._get_outer_frame()
-        self._module_frame = self._get_outer_frame().f_back
-        self.frame = self._get_outer_frame()
+        # Container items validation policy: "full", "none" or amount of first items to check
+        if check_items not in ("full", "none") and \
+                (not isinstance(check_items, int) or check_items < 0):
+            raise Exception(
+                f"check_items must be \"full\", \"none\" or amount of items, got: {check_items}")
+        if check_depth is not None and check_depth < 0:
+            raise Exception(
+                f"check_depth must be positive, got: {check_depth}")
+        self.check_items = check_items
+        self.check_depth: int = check_depth
+
+        # Index kind of the attribute: "hash", "sorted" or None
+        if index is True:
+            index = "hash"
+        elif index is False:
+            index = None
+        if index not in (None, "hash", "sorted"):
+            raise Exception(
+                f"index must be True, \"hash\" or \"sorted\", got: {index}")
+        if index is not None and lazy:
+            raise Exception("Lazy attributes can't be indexed")
+        self.index: str = index
+
+        # Computed lazy value is kept in the global lazy cache, and may be evicted from it
+        if evictable and not lazy:
+            raise Exception("Only lazy attributes can be evictable")
+        if evictable and final:
+            # NOTE: An evicted value is missing, so a final attribute could be set again
+            raise Exception("Evictable attributes can't be final")
+        self.evictable: bool = evictable
+
+        if _capture_frame:
+            outer_frame = self._get_outer_frame()
+            self._current_frame = outer_frame
+            self._module_frame = outer_frame.f_back
+            self.frame = outer_frame
+        else:
+            # Methods Info, types are never resolved so the frames aren't required
+            self._current_frame = None
+            self._module_frame = None
+            self.frame = None
+        # Explicit namespace and module name of string types, used instead of the frames
+        self._namespace: Dict[str, any] = None
+        self._module_name: str = None
 
         self._type = type
 
@@ -104,17 +187,29 @@ class Info(ModifiersList):
         obj = self._search_in_module_scopes(obj_type)
 
         if obj is None:
+            import pydoc
             obj = pydoc.locate(obj_type)
-            if obj is None or inspect.ismodule(obj):
-                obj = pydoc.locate(f"{self._in_module}.{obj_type}")
+            module_name = self._get_outer_module_name()
+            if (obj is None or isinstance(obj, types.ModuleType)) and module_name is not None:
+                obj = pydoc.locate(f"{module_name}.{obj_type}")
 
         if obj is None:
             raise Exception(f"Unknown Type {obj_type}")
-        elif inspect.ismodule(obj):
+        elif isinstance(obj, types.ModuleType):
             raise Exception(f"{obj_type} is module: {obj}")
         return obj
 
+    def _set_namespace(self, namespace: Dict[str, any], module_name: str):
+        self._namespace = namespace
+        self._module_name = module_name
+        # NOTE: Frames are no longer required, so they aren't kept alive by the class
+        self._current_frame = None
+        self._module_frame = None
+        self.frame = None
+
     def _search_in_module_scopes(self, obj_type):
+        if self._namespace is not None:
+            return self.search_in_dict(obj_type, self._namespace)
 
         # local frame search
         # NOTE: we dont save .f_locals as a var since it won't be updated.
@@ -144,16 +239,19 @@ class Info(ModifiersList):
                 found = False
                 break
 
-        if found and not inspect.ismodule(cur_dict):
+        if found and not isinstance(cur_dict, types.ModuleType):
             return cur_dict
         else:
             return None
 
     def _get_outer_module_name(self):
-        return inspect.getmodulename(self._get_outer_frame().f_code.co_filename)
+        if self._namespace is not None:
+            return self._module_name
+        import inspect
+        return inspect.getmodulename(self._current_frame.f_code.co_filename)
 
     def _get_outer_frame(self):
-        cur_frame = inspect.currentframe()
+        cur_frame = sys._getframe()
         self_filename = cur_frame.f_code.co_filename
         while True:
             cur_filename = cur_frame.f_code.co_filename
@@ -164,13 +262,15 @@ class Info(ModifiersList):
 
 
 class StaticInfo(Info):
-    def __init__(self, type=object, default: any = None, final: bool = False, allow_none=True, lazy: bool = False, before: None = None, around=None, after=None, _name=None) -> None:
+    def __init__(self, type=object, default: any = None, final: bool = False, allow_none=True, lazy: bool = False, check_items="full", check_depth=None, before: None = None, around=None, after=None, _name=None) -> None:
         super().__init__(type=type,
                          required=False,
                          default=default,
                          final=final,
                          allow_none=allow_none,
                          lazy=lazy,
+                         check_items=check_items,
+                         check_depth=check_depth,
                          before=before,
                          around=around,
                          after=after,
@@ -178,6 +278,146 @@ class StaticInfo(Info):
                          _name=_name)
 
 
+class ComputedInfo(Info):
+    def __init__(self, type=object, default: Callable = None, allow_none=True, check_items="full", check_depth=None, before: None = None, around=None, after=None, _name=None) -> None:
+        if not callable(default):
+            raise Exception(
+                f"Computed attribute default must be callable, got: {default}")
+
+        super().__init__(type=type,
+                         required=False,
+                         default=default,
+                         final=False,
+                         allow_none=allow_none,
+                         lazy=False,
+                         check_items=check_items,
+                         check_depth=check_depth,
+                         before=before,
+                         around=around,
+                         after=after,
+                         _computed=True,
+                         _name=_name)
+
+
+class Stream():
+    # Restartable stream of a large source, iterated by chunks rather than loaded at once.
+    # Sources: a file path (memory mapped), a bytes-like object, or a callable returning an iterable
+    def __init__(self, source, chunk_size: int = 1 << 20):
+        if chunk_size <= 0:
+            raise Exception(f"Stream chunk size must be positive, got {chunk_size}")
+        if not isinstance(source, (str, os.PathLike, bytes, bytearray, memoryview)) and not callable(source):
+            raise Exception(f"Unsupported stream source: {source}")
+
+        self.source = source
+        self.chunk_size: int = chunk_size
+        self._mapping = None
+        self._finalizer: weakref.finalize = None
+
+    def __iter__(self):
+        if callable(self.source):
+            return iter(self.source())
+        return self._iter_chunks(self._get_buffer())
+
+    def size(self) -> int:
+        # Size in bytes, None for callable sources
+        if callable(self.source):
+            return None
+        return len(self._get_buffer())
+
+    def close(self):
+        if self._finalizer is not None:
+            self._finalizer()
+        self._mapping = None
+        self._finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __reduce__(self):
+        return Stream, (self.source, self.chunk_size)
+
+    def __repr__(self):
+        return f"<kisa stream of {self.source!r}, chunk size {self.chunk_size}>"
+
+    def _iter_chunks(self, buffer):
+        view = memoryview(buffer)
+        for offset in range(0, len(view), self.chunk_size):
+            yield view[offset:offset + self.chunk_size]
+
+    def _get_buffer(self):
+        if not isinstance(self.source, (str, os.PathLike)):
+            return self.source
+
+        if self._mapping is None:
+            import mmap
+            with open(self.source, "rb") as source_file:
+                if os.fstat(source_file.fileno()).st_size == 0:
+                    # Empty files can't be mapped
+                    return b""
+                mapping = mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ)
+            # NOTE: Released when the stream is freed (e.g. with its instance), or closed
+            self._finalizer = weakref.finalize(self, Stream._release_mapping, mapping)
+            self._mapping = mapping
+        return self._mapping
+
+    @staticmethod
+    def _release_mapping(mapping):
+        try:
+            mapping.close()
+        except BufferError:
+            # Chunks are still in use, the mapping is released along with them
+            pass
+
+
+class StreamInfo(Info):
+    def __init__(self, default: any = None, chunk_size: int = 1 << 20, allow_none=True, before: None = None, around=None, after=None, _name=None) -> None:
+        if chunk_size <= 0:
+            raise Exception(f"Stream chunk size must be positive, got {chunk_size}")
+        self.chunk_size: int = chunk_size
+
+        # NOTE: The stream is created on first access, its source isn't read until iterated
+        super().__init__(type=Stream,
+                         required=default is None,
+                         default=default,
+                         allow_none=allow_none,
+                         lazy=default is not None,
+                         before=before,
+                         around=around,
+                         after=after,
+                         _name=_name)
+
+    def gen_stream_factory(self, source_factory: Callable[[any], any]) -> Callable[[any], Stream]:
+        chunk_size = self.chunk_size
+
+        def stream_factory(class_self):
+            source = source_factory(class_self)
+            if isinstance(source, Stream) or source is None:
+                return source
+
+            if isinstance(source, collections.abc.Iterator):
+                # Restarted by computing the default again
+                # NOTE: The instance is weakly referenced, so the stream doesn't keep it alive
+                instance_ref = weakref.ref(class_self)
+                first_iterator = [source]
+
+                def restart_source():
+                    if first_iterator:
+                        return first_iterator.pop()
+                    instance = instance_ref()
+                    if instance is None:
+                        raise Exception("Can't restart stream, its instance was freed")
+                    return source_factory(instance)
+
+                source = restart_source
+
+            return Stream(source, chunk_size)
+
+        return stream_factory
+
+
 # TODO: Support non Kisa inheritance
 # TODO: Support attribute modifiers for non Kisa inheritance
 # TODO: Support for multiple inheritance
@@ -188,6 +428,104 @@ def _raise(exception: Exception):
     raise exception
 
 
+def _is_special_attribute_name(attr_name: str) -> bool:
+    # Same as matching "^__.+__$"
+    return len(attr_name) > 4 and attr_name.startswith("__") and attr_name.endswith("__")
+
+
+def _compile_validator(var_type,
+                       resolve_type: Callable[[str], any],
+                       check_items: Union[str, int] = "full",
+                       check_depth: int = None) -> Callable[[any], bool]:
+    if var_type is any or var_type is object or var_type is Any or isinstance(var_type, TypeVar):
+        return lambda _val: True
+
+    if isinstance(var_type, (str, ForwardRef)):
+        # Forward reference, resolved on first use
+        type_name = var_type if isinstance(var_type, str) else var_type.__forward_arg__
+        resolved_validator = None
+
+        def forward_validator(val):
+            nonlocal resolved_validator
+            if resolved_validator is None:
+                resolved_validator = _compile_validator(resolve_type(type_name),
+                                                        resolve_type,
+                                                        check_items,
+                                                        check_depth)
+            return resolved_validator(val)
+        return forward_validator
+
+    origin = getattr(var_type, "__origin__", None)
+    type_args = getattr(var_type, "__args__", None) or ()
+
+    if origin is None:
+        try:
+            isinstance(None, var_type)
+        except TypeError:
+            raise Exception(f"Unsupported type: {var_type}")
+        return lambda val: isinstance(val, var_type)
+
+    def compile_arg(arg_type, arg_depth=check_depth):
+        return _compile_validator(arg_type, resolve_type, check_items, arg_depth)
+
+    if origin is Union:
+        args_validators = [compile_arg(arg) for arg in type_args]
+        return lambda val: any(validator(val) for validator in args_validators)
+    elif origin is getattr(typing, "Literal", None):
+        return lambda val: val in type_args
+    elif origin is type:
+        if len(type_args) == 0 or not isinstance(type_args[0], type):
+            return lambda val: isinstance(val, type)
+        return lambda val: isinstance(val, type) and issubclass(val, type_args[0])
+    elif not isinstance(origin, type):
+        raise Exception(f"Unsupported type: {var_type}")
+    elif origin is collections.abc.Callable:
+        return callable
+
+    if check_items == "none" or check_depth == 0 or len(type_args) == 0 \
+            or not issubclass(origin, collections.abc.Collection):
+        # NOTE: Items of non collections (e.g. iterators) are not checked, since checking consumes them
+        return lambda val: isinstance(val, origin)
+
+    items_limit = None if check_items == "full" else check_items
+    items_depth = None if check_depth is None else check_depth - 1
+
+    if issubclass(origin, tuple):
+        if len(type_args) == 2 and type_args[1] is Ellipsis:
+            type_args = type_args[:1]
+        elif type_args == ((),):
+            return lambda val: isinstance(val, tuple) and len(val) == 0
+        else:
+            items_validators = [compile_arg(arg, items_depth)
+                                for arg in type_args]
+
+            def tuple_validator(val):
+                if not isinstance(val, origin) or len(val) != len(items_validators):
+                    return False
+                checked = zip(items_validators, val)
+                return all(validator(item) for validator, item in itertools.islice(checked, items_limit))
+            return tuple_validator
+
+    if issubclass(origin, collections.abc.Mapping):
+        key_validator = compile_arg(type_args[0], items_depth)
+        value_validator = compile_arg(type_args[-1], items_depth)
+
+        def mapping_validator(val):
+            if not isinstance(val, origin):
+                return False
+            return all(key_validator(key) and value_validator(value)
+                       for key, value in itertools.islice(val.items(), items_limit))
+        return mapping_validator
+
+    item_validator = compile_arg(type_args[0], items_depth)
+
+    def collection_validator(val):
+        if not isinstance(val, origin):
+            return False
+        return all(item_validator(item) for item in itertools.islice(val, items_limit))
+    return collection_validator
+
+
 class _KisaDict(dict):
     def __init__(self, class_name):
         self.class_name = class_name
@@ -209,7 +547,9 @@ class _AbstractEntity(_BasicKisaType):
                      is_implemented,
                      extends,
                      implements,
-                     kisa_class_type):
+                     kisa_class_type,
+                     descriptors=False,
+                     trace=None):
         kisa_internal = _KisaInternal(cls=cls,
                                       clsname=clsname,
                                       bases=bases,
@@ -218,7 +558,9 @@ class _AbstractEntity(_BasicKisaType):
                                       extends=extends,
                                       implements=implements,
                                       is_extandable=is_extandable,
-                                      is_implemented=is_implemented)
+                                      is_implemented=is_implemented,
+                                      descriptors=descriptors,
+                                      trace=trace)
 
         _AbstractEntity._disable_abstract_public_constructor(kisa_internal)
         _AbstractEntity._enable_abstract_method(kisa_internal, clsname)
@@ -272,7 +614,7 @@ class _AbstractEntity(_BasicKisaType):
 
 
 class AbstractClass(_AbstractEntity):
-    def __new__(cls, clsname, bases, class_desc, extends=object, implements=[]):
+    def __new__(cls, clsname, bases, class_desc, extends=object, implements=[], descriptors=False, trace=None):
         kisa_internal = _AbstractEntity.abstract_new(cls=cls,
                                                      clsname=clsname,
                                                      bases=bases,
@@ -281,7 +623,9 @@ class AbstractClass(_AbstractEntity):
                                                      is_extandable=True,
                                                      is_implemented=False,
                                                      extends=extends,
-                                                     implements=implements)
+                                                     implements=implements,
+                                                     descriptors=descriptors,
+                                                     trace=trace)
 
         created_class = kisa_internal.generate()
         return created_class
@@ -307,7 +651,24 @@ class Interface(_AbstractEntity):
 
 
 class Class(_BasicKisaType):
-    def __new__(cls, clsname, bases, class_desc, extends=object, implements=[]):
+    def __new__(cls,
+                clsname,
+                bases,
+                class_desc,
+                extends=object,
+                implements=[],
+                singleton=False,
+                multiton_key=None,
+                pool_size=None,
+                frozen=False,
+                intern=False,
+                track_changes=False,
+                validation=None,
+                descriptors=False,
+                eq=False,
+                order=False,
+                hash=False,
+                trace=None):
         kisa_internal = _KisaInternal(cls=cls,
                                       clsname=clsname,
                                       bases=bases,
@@ -316,7 +677,19 @@ class Class(_BasicKisaType):
                                       extends=extends,
                                       implements=implements,
                                       is_extandable=True,
-                                      is_implemented=False)
+                                      is_implemented=False,
+                                      singleton=singleton,
+                                      multiton_key=multiton_key,
+                                      pool_size=pool_size,
+                                      frozen=frozen,
+                                      intern=intern,
+                                      track_changes=track_changes,
+                                      validation=validation,
+                                      descriptors=descriptors,
+                                      eq=eq,
+                                      order=order,
+                                      hash=hash,
+                                      trace=trace)
 
         created_class = kisa_internal.generate()
         return created_class
@@ -327,6 +700,540 @@ class _PrivateVars():
         self.private_vars = {}
 
 
+class _ObjectPool():
+    def __init__(self, size: int, reset: Callable[[any], None]) -> None:
+        self.size: int = size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.discarded: int = 0
+        self._reset: Callable[[any], None] = reset
+        self._free_instances: list = []
+        self._free_ids: MutableSet[int] = set()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if len(self._free_instances) == 0:
+                self.misses += 1
+                return None
+            self.hits += 1
+            instance = self._free_instances.pop()
+            self._free_ids.discard(id(instance))
+            return instance
+
+    def release(self, instance):
+        with self._lock:
+            if id(instance) in self._free_ids:
+                raise Exception(f"Instance was already released: {instance}")
+            if len(self._free_instances) >= self.size:
+                self.discarded += 1
+                return
+            self._reset(instance)
+            self._free_instances.append(instance)
+            self._free_ids.add(id(instance))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": self.size,
+                    "available": len(self._free_instances),
+                    "hits": self.hits,
+                    "misses": self.misses,
+                    "discarded": self.discarded}
+
+
+def _report_deferred_error(error: Exception):
+    import traceback
+    traceback.print_exception(type(error), error, error.__traceback__)
+
+
+class _LiveInstances():
+    # Weakly referenced live instances of a class. Keyed by id, since instances
+    # are added before their values are set, so they can't be hashed yet
+    def __init__(self):
+        self._refs: Dict[int, weakref.ref] = {}
+
+    def add(self, instance):
+        instance_id = id(instance)
+        self._refs[instance_id] = weakref.ref(instance,
+                                              lambda ref: self._discard(instance_id, ref))
+
+    def instances(self) -> list:
+        instances = []
+        for ref in list(self._refs.values()):
+            instance = ref()
+            if instance is not None:
+                instances.append(instance)
+        return instances
+
+    def _discard(self, instance_id: int, ref: weakref.ref):
+        # NOTE: The id may have been reused by a newer instance
+        if self._refs.get(instance_id) is ref:
+            self._refs.pop(instance_id, None)
+
+
+class _AttributeIndex():
+    # Attribute value -> instances holding it. Instances are weakly referenced and kept by id,
+    # rather than in a WeakSet, since instances of compared classes may be equal to each other
+    def __init__(self, var_name: str, is_sorted: bool):
+        self.var_name = var_name
+        self.is_sorted = is_sorted
+        self._buckets: Dict[any, Dict[int, weakref.ref]] = {}
+        # Distinct values by order, None if not sorted. None values aren't ordered
+        self._sorted_values: list = [] if is_sorted else None
+        self._bisect: types.ModuleType = None
+        if is_sorted:
+            import bisect
+            self._bisect = bisect
+        # NOTE: Reentrant, since instances may be freed (and removed) while the lock is held
+        self._lock = threading.RLock()
+
+    def update(self, instance, old_value, new_value):
+        instance_id = id(instance)
+        try:
+            with self._lock:
+                bucket = self._buckets.get(new_value)
+                if bucket is not None and instance_id in bucket:
+                    # Equal to the old value, already indexed
+                    return
+                self._add(instance, new_value)
+                if old_value is not _NotLoaded:
+                    self._discard(instance_id, old_value)
+        except TypeError as e:
+            raise Exception(
+                f"Can't index \"{self.var_name}\" value: {new_value} :: {e}")
+
+    def remove(self, instance, value):
+        with self._lock:
+            self._discard(id(instance), value)
+
+    def find(self, value) -> list:
+        with self._lock:
+            bucket = self._buckets.get(value)
+            if bucket is None:
+                return []
+            return self._get_instances([bucket])
+
+    def find_range(self, low=None, high=None) -> list:
+        with self._lock:
+            start = 0 if low is None else self._bisect.bisect_left(self._sorted_values, low)
+            stop = len(self._sorted_values) if high is None else self._bisect.bisect_right(self._sorted_values, high)
+            return self._get_instances([self._buckets[value] for value in self._sorted_values[start:stop]])
+
+    def _add(self, instance, value):
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            if self.is_sorted and value is not None:
+                # NOTE: Inserted first, so incomparable values aren't indexed at all
+                self._bisect.insort(self._sorted_values, value)
+            bucket = {}
+            self._buckets[value] = bucket
+
+        instance_id = id(instance)
+        bucket[instance_id] = weakref.ref(instance,
+                                          lambda ref: self._discard(instance_id, value, ref))
+
+    def _discard(self, instance_id: int, value, ref: weakref.ref = None):
+        with self._lock:
+            bucket = self._buckets.get(value)
+            if bucket is None or instance_id not in bucket:
+                return
+            if ref is not None and bucket[instance_id] is not ref:
+                # The id was reused by a newer instance
+                return
+
+            del bucket[instance_id]
+            if len(bucket) == 0:
+                del self._buckets[value]
+                if self.is_sorted and value is not None:
+                    del self._sorted_values[self._bisect.bisect_left(self._sorted_values, value)]
+
+    @staticmethod
+    def _get_instances(buckets: List[Dict[int, weakref.ref]]) -> list:
+        instances = []
+        for bucket in buckets:
+            for ref in bucket.values():
+                instance = ref()
+                if instance is not None:
+                    instances.append(instance)
+        return instances
+
+
+class _Tracer():
+    # Records spans of the traced methods calls, nested by the calls of each thread
+    _static_unsampled = object()
+
+    def __init__(self):
+        self.exporter = None
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        # Random generator of the sampling, set once a sample rate below 1 is configured
+        self._random: Callable[[], float] = None
+
+    def enable_sampling(self):
+        if self._random is None:
+            import random
+            self._random = random.random
+
+    def start(self, name: str, kind: str, modifier: str, sample_rate: float = None):
+        if self.exporter is None:
+            return None
+
+        stack = self._local.__dict__.setdefault("stack", [])
+        if len(stack) == 0:
+            if sample_rate is None:
+                return None
+            elif sample_rate < 1 and self._random() >= sample_rate:
+                # NOTE: Nested calls are part of the same trace, so they aren't sampled either
+                stack.append(_Tracer._static_unsampled)
+                return _Tracer._static_unsampled
+            parent = None
+        else:
+            parent = stack[-1]
+            if parent is _Tracer._static_unsampled:
+                return None
+
+        span_id = next(self._ids)
+        span = {"name": name,
+                "kind": kind,
+                "modifier": modifier,
+                "trace_id": span_id if parent is None else parent["trace_id"],
+                "span_id": span_id,
+                "parent_id": None if parent is None else parent["span_id"],
+                "thread": threading.get_ident(),
+                "start": time.time(),
+                "duration": None,
+                "error": None,
+                "_start_counter": time.perf_counter()}
+        stack.append(span)
+        return span
+
+    def end(self, span):
+        stack = self._local.stack
+        stack.pop()
+        if span is _Tracer._static_unsampled:
+            return
+
+        span["duration"] = time.perf_counter() - span.pop("_start_counter")
+        exporter = self.exporter
+        if exporter is not None:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                _report_deferred_error(e)
+
+
+class MemoryExporter():
+    # Keeps the last spans in memory
+    def __init__(self, size: int = 1024):
+        if size <= 0:
+            raise Exception(f"Exporter size must be positive, got {size}")
+        self._spans = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict[str, any]):
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> List[Dict[str, any]]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class JsonlExporter():
+    # Appends the spans to a file, a JSON object per line
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict[str, any]):
+        import json
+        line = json.dumps(span, default=repr)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class _LazyCache():
+    # LRU of the evictable lazy values of all instances. Evicted values are removed from
+    # their instance, and computed again by the next read
+    def __init__(self, max_entries: int = None, max_bytes: int = None):
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        # NOTE: Shallow by default, the objects referenced by a value aren't counted
+        self.sizeof: Callable[[any], int] = sys.getsizeof
+        self.bytes: int = 0
+        self.evictions: int = 0
+        # (instance id, attribute name) -> [instance weak reference, value size]
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+        # NOTE: Reentrant, since instances may be freed (and removed) while the lock is held
+        self._lock = threading.RLock()
+
+    def configure(self, max_entries: int, max_bytes: int, sizeof: Callable[[any], int]):
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self.sizeof = sizeof
+            self._evict()
+
+    def add(self, instance, var_name: str, value):
+        key = (id(instance), var_name)
+        ref = weakref.ref(instance, lambda ref: self._discard(key, ref))
+        with self._lock:
+            self._discard(key)
+            size = self.sizeof(value)
+            self._entries[key] = [ref, size]
+            self.bytes += size
+            self._evict()
+
+    def touch(self, instance, var_name: str):
+        with self._lock:
+            key = (id(instance), var_name)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def discard(self, instance, var_name: str):
+        with self._lock:
+            self._discard((id(instance), var_name))
+
+    def contains(self, instance, var_name: str) -> bool:
+        with self._lock:
+            return (id(instance), var_name) in self._entries
+
+    def discard_instance(self, instance, var_names):
+        # Removes the entries of an instance which is reset (e.g. released to its pool)
+        with self._lock:
+            if len(self._entries) == 0:
+                return
+            instance_id = id(instance)
+            for var_name in var_names:
+                self._discard((instance_id, var_name))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries),
+                    "bytes": self.bytes,
+                    "max_entries": self.max_entries,
+                    "max_bytes": self.max_bytes,
+                    "evictions": self.evictions}
+
+    def _discard(self, key: tuple, ref: weakref.ref = None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (ref is not None and entry[0] is not ref):
+                return
+            del self._entries[key]
+            self.bytes -= entry[1]
+
+    def _evict(self):
+        # NOTE: The newest value is never evicted, since it's about to be read
+        while len(self._entries) > 1 and self._is_full():
+            (_instance_id, var_name), (ref, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            instance = ref()
+            if instance is not None:
+                _KisaInternal._get_instance_private_data(instance).private_vars.pop(var_name, None)
+
+    def _is_full(self) -> bool:
+        return (self.max_entries is not None and len(self._entries) > self.max_entries) or \
+            (self.max_bytes is not None and self.bytes > self.max_bytes)
+
+
+class _DeferredExecutor():
+    # Runs deferred after modifiers on a background thread, by order of submission
+
+    _static_overflow_policies = ("block", "drop", "inline")
+
+    def __init__(self,
+                 max_pending: int,
+                 batch_size: int,
+                 overflow: str,
+                 on_error: Callable[[Exception], None],
+                 exit_timeout: float = 5.0) -> None:
+        if max_pending <= 0:
+            raise Exception(f"Deferred max_pending must be positive, got {max_pending}")
+        if batch_size <= 0:
+            raise Exception(f"Deferred batch_size must be positive, got {batch_size}")
+        if overflow not in _DeferredExecutor._static_overflow_policies:
+            raise Exception(
+                f"Unknown deferred overflow policy \"{overflow}\", expected one of: {', '.join(_DeferredExecutor._static_overflow_policies)}")
+
+        self.max_pending: int = max_pending
+        self.batch_size: int = batch_size
+        self.overflow: str = overflow
+        self.on_error: Callable[[Exception], None] = on_error
+        # Maximum seconds to wait for the pending modifiers on exit, None waits with no limit
+        self.exit_timeout: float = exit_timeout
+        self.executed: int = 0
+        self.dropped: int = 0
+        self.failed: int = 0
+        self._tasks = collections.deque()
+        # Amount of tasks taken by the worker and not done yet
+        self._running: int = 0
+        self._condition = threading.Condition()
+        self._worker: threading.Thread = None
+        # Set by shutdown, the worker stops once the pending modifiers are run
+        self._closed: bool = False
+
+    def submit(self, callback: Callable, args: tuple, kwargs: Dict[str, any]):
+        task = (callback, args, kwargs)
+        with self._condition:
+            if self._worker is None and not self._closed:
+                self._start_worker()
+
+            while not self._closed and len(self._tasks) >= self.max_pending:
+                if self.overflow == "drop":
+                    self.dropped += 1
+                    return
+                elif self.overflow == "inline" or threading.current_thread() is self._worker:
+                    # NOTE: The worker can't wait for itself to make room
+                    break
+                self._condition.wait()
+            else:
+                if not self._closed:
+                    self._tasks.append(task)
+                    self._condition.notify_all()
+                    return
+
+        # NOTE: Submitted after shutdown (e.g. by a racing reconfiguration), run by the caller
+        self._run(task)
+
+    def flush(self, timeout: float = None) -> bool:
+        if threading.current_thread() is self._worker:
+            raise Exception("Can't flush deferred modifiers from a deferred modifier")
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self._tasks) == 0 and self._running == 0,
+                                            timeout)
+
+    def shutdown(self, timeout: float = None) -> bool:
+        # Runs the pending modifiers and stops the worker, returns False on timeout
+        if threading.current_thread() is self._worker:
+            raise Exception("Can't reconfigure deferred modifiers from a deferred modifier")
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is None:
+            return True
+
+        import atexit
+        atexit.unregister(self._flush_on_exit)
+        worker.join(timeout)
+        return not worker.is_alive()
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {"pending": len(self._tasks) + self._running,
+                    "executed": self.executed,
+                    "dropped": self.dropped,
+                    "failed": self.failed}
+
+    def _start_worker(self):
+        import atexit
+
+        self._worker = threading.Thread(target=self._work,
+                                        name="kisa-deferred",
+                                        daemon=True)
+        self._worker.start()
+        # Deferred modifiers of the process are not lost on exit
+        atexit.register(self._flush_on_exit)
+
+    def _flush_on_exit(self):
+        # NOTE: Bounded, so a stuck modifier doesn't hang the interpreter shutdown
+        self.flush(self.exit_timeout)
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while len(self._tasks) == 0 and not self._closed:
+                    self._condition.wait()
+                if len(self._tasks) == 0:
+                    # Shut down, and all of the pending modifiers were run
+                    return
+                # NOTE: Taken in batches, so the lock is acquired once per batch rather than per task
+                batch = [self._tasks.popleft()
+                         for _ in range(min(self.batch_size, len(self._tasks)))]
+                self._running = len(batch)
+                # Wake the callers waiting for room
+                self._condition.notify_all()
+
+            for task in batch:
+                self._run(task)
+
+            with self._condition:
+                self._running = 0
+                # Wake the callers waiting for flush
+                self._condition.notify_all()
+
+    def _run(self, task):
+        callback, args, kwargs = task
+        try:
+            callback(*args, **kwargs)
+        except Exception as e:
+            with self._condition:
+                self.failed += 1
+            self.on_error(e)
+        else:
+            with self._condition:
+                self.executed += 1
+
+
+class _DirectAttributeDescriptor():
+    # Attribute of a descriptors class with no modifiers. Not a data descriptor, so once set the
+    # value is read by Python directly from the instance __dict__, and the accessor is called only
+    # while it's missing (e.g. lazy attributes). Values are set by the class __setattr__
+    def __init__(self, name: str, accessor: Callable):
+        self.name = name
+        self.accessor = accessor
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return self.accessor(instance)
+
+    def __repr__(self):
+        return f"<kisa attribute \"{self.name}\">"
+
+
+class _AttributeDescriptor(_DirectAttributeDescriptor):
+    # Attribute of a descriptors class, read and set through its accessor
+    def __set__(self, instance, value):
+        self.accessor(instance, value)
+
+
+class _NotLoaded():
+    # Packed value of a lazy attribute which wasn't loaded yet
+    pass
+
+
+class _SharedBatch():
+    # Kisa instances packed into a shared memory block. Only the block name is
+    # pickled, so the batch is cheap to send to worker processes
+    def __init__(self, name: str, size: int, length: int):
+        self.name = name
+        self.size = size
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f"<kisa shared batch \"{self.name}\" of {self.length} instances, {self.size} bytes>"
+
+
+def _restore_instance(kisa_class, values: Dict[str, any] = None):
+    # Unpickles Kisa instances
+    return _KisaInternal._get_class_private_data(kisa_class).kisa_internal._restore_instance(values)
+
+
 class _PrivateClassData(_PrivateVars):
     def __init__(self, class_name, kisa_class_type, is_extandable, is_implemented):
         super().__init__()
@@ -338,7 +1245,40 @@ class _PrivateClassData(_PrivateVars):
         self.implemented_interfaces = []
         self.class_id: int = _KisaInternal.gen_class_id()
         self.internal_constructor: Callable[[any, Dict[str, any]]] = None
+        self.set_attribute_value: Callable[[any, str, any, bool], any] = None
+        self.evolve: Callable[[any, Dict[str, any]], any] = None
         self.methods_names: AbstractSet[Callable] = set()
+        # Instances cached by singleton/multiton classes, keyed by the multiton key value
+        self.cached_instances: Dict[any, any] = {}
+        self.pool: _ObjectPool = None
+        self.is_frozen: bool = False
+        # Instances of interned classes, keyed by their values, None unless interned
+        self.interned_instances: weakref.WeakValueDictionary = None
+        # Names of all instance attributes (including inherited), by declaration order
+        self.instance_vars_names: List[str] = []
+        self.track_changes: bool = False
+        self.has_computed: bool = False
+        # Generated __eq__/__hash__ and ordering methods, by the instance attributes values
+        self.eq: bool = False
+        self.order: bool = False
+        # Attributes are accessed as Python attributes (obj.x / obj.x = v) rather than called
+        self.descriptors: bool = False
+        # Instance attribute name (including inherited) -> its accessor, called as accessor(instance, *args)
+        self.accessors: Dict[str, Callable] = {}
+        # Indexed instance attribute name (including inherited) -> its index
+        self.indexes: Dict[str, _AttributeIndex] = {}
+        # Descriptor attributes read directly from the instance __dict__, with no accessor call
+        self.direct_attributes: MutableSet[str] = set()
+        self.memoized_methods: Dict[str, _MemoizedMethod] = {}
+        self.change_observers: List[Callable[[any, AbstractSet[str]], None]] = []
+        # The generator of the class, used by the compiler
+        self.kisa_internal: _KisaInternal = None
+        # Static attribute name -> lock of its atomic operations
+        self.static_locks: Dict[str, threading.RLock] = {}
+        # Live instances of the class (not including subclasses), None unless tracked
+        self.live_instances: _LiveInstances = None
+        if _KisaInternal._static_track_instances:
+            self.live_instances = _LiveInstances()
         self.on_functions_declared: Callable[[
             List[_PrivateClassData]], None] = lambda _: None
 
@@ -353,6 +1293,41 @@ class _PrivateClassData(_PrivateVars):
 class _PrivateObjectData(_PrivateVars):
     def __init__(self):
         super().__init__()
+        self.cached_hash: int = None
+        # Names of attributes set since the last checkpoint, None if not tracked
+        self.changed_fields: MutableSet[str] = None
+
+        # Computed attributes data, None if class has no computed attributes
+        self.computed_values: Dict[str, any] = None
+        # Attribute name -> Names of the computed attributes which read it
+        self.dependents: Dict[str, MutableSet[str]] = None
+        # Attributes read by each of the computations in progress
+        self.computing: List[MutableSet[str]] = None
+
+        # Memoized method -> its LRU cache of the instance
+        self.memoized: Dict[_MemoizedMethod, collections.OrderedDict] = None
+
+    def reset(self):
+        self.private_vars.clear()
+        self.cached_hash = None
+        self.clear_changes()
+        if self.computed_values is not None:
+            self.computed_values.clear()
+            self.dependents.clear()
+        self.memoized = None
+
+    def clear_changes(self):
+        if self.changed_fields is not None:
+            self.changed_fields.clear()
+
+    def invalidate(self, var_name):
+        dependents = self.dependents.pop(var_name, None)
+        if dependents is None:
+            return
+
+        for computed_name in dependents:
+            self.computed_values.pop(computed_name, None)
+            self.invalidate(computed_name)
 
 
 class _KisaInternal():
@@ -361,6 +1336,17 @@ class _KisaInternal():
     _static_internal_class_id = 0
     _static_kisa_classes = set()
     _static_classes_data: Dict[any, _PrivateClassData] = {}
+    _static_obj_private_vars_name: str = "___KISA_PRIVATE__"
+    _static_validation_modes = ("full", "construct", "off")
+    _static_validation_mode: str = os.environ.get("KISA_VALIDATION", "full")
+    _static_track_instances: bool = False
+    # Marks the next construction of the current thread as trusted (see from_trusted)
+    _static_trusted_construction = threading.local()
+    # Created on first use, so no thread is started unless deferred modifiers are used
+    _static_deferred_executor: _DeferredExecutor = None
+    _static_deferred_executor_lock = threading.Lock()
+    _static_tracer: _Tracer = _Tracer()
+    _static_lazy_cache: _LazyCache = _LazyCache(max_entries=1024)
 
     def __init__(self,
                  cls,
@@ -371,10 +1357,22 @@ class _KisaInternal():
                  bases,
                  is_extandable: bool,  # is created class can be used in extends
                  is_implemented: bool,  # is created class can be used in implements
-                 kisa_class_type):
+                 kisa_class_type,
+                 singleton: bool = False,
+                 multiton_key: str = None,
+                 pool_size: int = None,
+                 frozen: bool = False,
+                 intern: bool = False,
+                 track_changes: bool = False,
+                 validation: str = None,
+                 descriptors: bool = False,
+                 eq: bool = False,
+                 order: bool = False,
+                 hash: bool = False,
+                 trace: Union[float, Dict[str, float]] = None):
 
         self._super_name: str = "_super"
-        self._obj_private_vars_name: str = "___KISA_PRIVATE__"
+        self._obj_private_vars_name: str = _KisaInternal._static_obj_private_vars_name
         self._attribute_modifiers: List[_AttributeModifier] = []
         self._inherit_attribute_modifiers: dict[str, ModifiersList] = {}
         self._vars_info: Dict[str, Info] = {}
@@ -392,6 +1390,73 @@ class _KisaInternal():
         self._on_external_constructor_called: Callable[[
             any], None] = lambda _: None
 
+        if singleton and multiton_key is not None:
+            raise Exception(
+                f"Class \"{clsname}\" can't be both singleton and multiton")
+        self._singleton: bool = singleton
+        self._multiton_key: str = multiton_key
+
+        if pool_size is not None:
+            if singleton or multiton_key is not None:
+                raise Exception(
+                    f"Class \"{clsname}\" can't both cache and pool its instances")
+            if pool_size <= 0:
+                raise Exception(
+                    f"Pool size of class \"{clsname}\" must be positive, got {pool_size}")
+        self._pool_size: int = pool_size
+
+        if intern:
+            if not frozen:
+                raise Exception(
+                    f"Class \"{clsname}\" must be frozen in order to be interned")
+            if singleton or multiton_key is not None or pool_size is not None:
+                raise Exception(
+                    f"Interned class \"{clsname}\" can't cache or pool its instances")
+        self._private_class_data.is_frozen = frozen
+        self._intern: bool = intern
+        self._private_class_data.track_changes = track_changes
+        self._private_class_data.descriptors = descriptors
+        # NOTE: Ordered instances are compared for equality by the same values
+        self._private_class_data.eq = eq or order or (frozen and not intern)
+        self._private_class_data.order = order
+        # NOTE: Values of mutable instances may change, so they are hashed only if asked explicitly
+        if hash and not self._private_class_data.eq:
+            raise Exception(
+                f"Class \"{clsname}\" must be compared by value (eq=True) in order to be hashed by value")
+        self._hash: bool = hash
+
+        # Tracing sample rate of the methods, or of the given methods/attributes
+        if isinstance(trace, dict):
+            trace_rates = dict(trace)
+        else:
+            trace_rates = {} if trace is None else {None: trace}
+        for sample_rate in trace_rates.values():
+            if not isinstance(sample_rate, (int, float)) or not 0 <= sample_rate <= 1:
+                raise Exception(
+                    f"Trace sample rate of class \"{clsname}\" must be between 0 and 1, got: {sample_rate}")
+            if sample_rate < 1:
+                _KisaInternal._static_tracer.enable_sampling()
+        self._trace_rates: Dict[str, float] = trace_rates
+
+        if validation is None:
+            validation = _KisaInternal._static_validation_mode
+        _KisaInternal._validate_validation_mode(validation)
+        self._validation_mode: str = validation
+
+        # Setters used during construction, when differ from the public accessor (e.g. frozen)
+        self._internal_setters: Dict[str, Callable] = {}
+        # Setters used by trusted construction, without type validation (None until first used)
+        self._trusted_setters: Dict[str, Callable] = {}
+        self._intern_instance: Callable[[any], any] = lambda instance: instance
+        self._values_getter: Callable[[Dict[str, any]], tuple] = lambda _private_vars: ()
+        # Names of the evictable instance attributes (including inherited)
+        self._evictable_vars_names: List[str] = []
+
+        # Default value generators, receives the class self
+        self._default_factories: Dict[str, Callable[[any], any]] = {}
+        # Compiled type validators of the attributes
+        self._validators: Dict[str, Callable[[any], bool]] = {}
+
         # Ensure implements will be formatted as list or tuple.
         # This enables us to allow the implements format to be as following:
         # * implements=SomeInterface
@@ -419,8 +1484,16 @@ class _KisaInternal():
         self._set_attribute_modifiers()
 
         self._add_vars_to_class()
+        self._add_descriptors_to_class()
         self._add_methods_to_class()
         self._add_special_attributes_to_class()
+        self._add_trusted_constructor_to_class()
+        self._add_comparison_methods_to_class()
+        self._add_copy_methods_to_class()
+        self._add_index_queries_to_class()
+        self._add_instance_cache_to_class()
+        self._add_instance_pool_to_class()
+        self._add_instance_interning_to_class()
 
         self._created_class = type(self._private_class_data.class_name,
                                    tuple(self._bases),
@@ -433,6 +1506,9 @@ class _KisaInternal():
     def _add_special_attributes_to_class(self):
         for special_attr in self._special_attributes_info.keys():
             info = self._special_attributes_info[special_attr]
+            if special_attr == "__getattribute__" and not info.has_modifiers():
+                # NOTE: Only delegates to the parent, so it's required only when modified
+                continue
             self._class_attrs[special_attr] = self._gen_class_method(special_attr,
                                                                      info.default,
                                                                      info)
@@ -445,40 +1521,150 @@ class _KisaInternal():
                                                                   info)
 
     def _add_vars_to_class(self):
+        validate_on_set = self._validation_mode == "full"
+        validate_on_construct = self._validation_mode != "off"
+        instance_vars_names = []
+        evictable_vars_names = []
+        if _KisaInternal._is_class_kisa(self._private_class_data.extends_class):
+            extends_class_data = _KisaInternal._get_class_private_data(self._private_class_data.extends_class)
+            instance_vars_names.extend(extends_class_data.instance_vars_names)
+            evictable_vars_names.extend(extends_class_data.kisa_internal._evictable_vars_names)
+
         for var_name in self._vars_info.keys():
             info = self._vars_info[var_name]
-            if info.final:
-                info.add_around(self._gen_around_final_attr(var_name))
+            self._default_factories[var_name] = self._gen_default_factory(info)
+            if not isinstance(info._type, str):
+                # NOTE: Fails on invalid types when the class is created, rather than on the first set
+                self._compile_attribute_validator(var_name)
+            if info.index is not None:
+                if info.static or info.computed:
+                    raise Exception(
+                        f"Only instance attributes can be indexed, got \"{var_name}\"")
+                self._private_class_data.indexes[var_name] = _AttributeIndex(var_name,
+                                                                             is_sorted=info.index == "sorted")
+            if info.computed:
+                self._private_class_data.has_computed = True
+                self._class_attrs[var_name] = self._gen_class_method(var_name,
+                                                                     self._gen_computed_attribute_get(
+                                                                         var_name),
+                                                                     info)
+                continue
+
+            if info.static:
+                # NOTE: Reentrant, so modifiers may use the attribute atomic operations as well
+                self._private_class_data.static_locks[var_name] = threading.RLock()
+                if not info.has_modifiers() and self._get_trace_rate(var_name) is None:
+                    # Fast path, accessed directly with no modifiers chain
+                    self._class_attrs[var_name] = staticmethod(self._gen_static_attribute_get_set(
+                        var_name,
+                        validate=validate_on_set,
+                        final=info.final))
+                    continue
+
+                if info.final:
+                    info.add_around(self._gen_around_final_attr(var_name))
+
+                self._class_attrs[var_name] = self._gen_class_method(var_name,
+                                                                     self._gen_attribute_get_set(
+                                                                         var_name,
+                                                                         validate=validate_on_set),
+                                                                     info)
+                continue
+
+            instance_vars_names.append(var_name)
+
+            if self._private_class_data.is_frozen:
+                # Frozen attributes are set only by the constructor, no setter is exposed
+                self._class_attrs[var_name] = self._gen_class_method(var_name,
+                                                                     self._gen_frozen_attribute_get(
+                                                                         var_name),
+                                                                     info)
+            else:
+                if info.final:
+                    info.add_around(self._gen_around_final_attr(var_name))
+
+                self._class_attrs[var_name] = self._gen_class_method(var_name,
+                                                                     self._gen_attribute_get_set(
+                                                                         var_name,
+                                                                         validate=validate_on_set),
+                                                                     info)
+
+            if self._private_class_data.is_frozen or validate_on_construct != validate_on_set:
+                self._internal_setters[var_name] = self._gen_class_method(var_name,
+                                                                          self._gen_attribute_get_set(
+                                                                              var_name,
+                                                                              validate=validate_on_construct),
+                                                                          info)
+            if validate_on_construct:
+                # NOTE: Generated on first use, most classes are never constructed as trusted
+                self._trusted_setters[var_name] = None
+
+        self._private_class_data.instance_vars_names = instance_vars_names
+        evictable_vars_names.extend(var_name for var_name, info in self._vars_info.items()
+                                    if info.evictable and not info.static)
+        self._evictable_vars_names = evictable_vars_names
+        self._values_getter = self._gen_values_getter(instance_vars_names)
+
+        for var_name, info in self._vars_info.items():
+            if not info.static:
+                self._private_class_data.accessors[var_name] = self._class_attrs[var_name]
+                if info.has_modifiers() or info.computed or info.evictable:
+                    # NOTE: Reads of evictable values are tracked by the lazy cache
+                    self._private_class_data.direct_attributes.discard(var_name)
+                else:
+                    self._private_class_data.direct_attributes.add(var_name)
 
-            self._class_attrs[var_name] = self._gen_class_method(var_name,
-                                                                 self._gen_attribute_get_set(
-                                                                     var_name),
-                                                                 info)
+    @staticmethod
+    def _gen_values_getter(vars_names: List[str]) -> Callable[[Dict[str, any]], tuple]:
+        # Returns the values of the attributes from the private storage, by declaration order.
+        # Raises KeyError if a value is missing (e.g. a lazy attribute which wasn't loaded yet)
+        if len(vars_names) == 0:
+            return lambda _private_vars: ()
+        elif len(vars_names) == 1:
+            var_name = vars_names[0]
+            return lambda private_vars: (private_vars[var_name],)
+        return operator.itemgetter(*vars_names)
+
+    def _add_descriptors_to_class(self):
+        if not self._private_class_data.descriptors:
+            return
+
+        # NOTE: Reads of computed attributes dependencies must go through the accessors
+        has_direct_reads = not self._private_class_data.has_computed
+        direct_attributes = self._private_class_data.direct_attributes
+        for var_name, accessor in self._private_class_data.accessors.items():
+            if has_direct_reads and var_name in direct_attributes:
+                self._class_attrs[var_name] = _DirectAttributeDescriptor(var_name, accessor)
+            else:
+                self._class_attrs[var_name] = _AttributeDescriptor(var_name, accessor)
+        # NOTE: The values are kept in the instance __dict__, so deleting them must be blocked
+        self._class_attrs['__delattr__'] = self._gen_descriptors_class_deleter()
 
     def _gen_around_final_attr(self, var_name):
-        was_called = False
         is_static = self._vars_info[var_name].static
 
         def inner(*args, **kwargs):
             args = [*args]
 
-            if not is_static:
-                args.pop(0)
+            if is_static:
+                private_vars_table: _PrivateVars = self._private_class_data
+            else:
+                private_vars_table: _PrivateVars = self._get_private_vars(
+                    args.pop(0))
 
             attr_name = args.pop(0)
             next = args.pop(0)
 
-            nonlocal was_called
             if len(args) == 0:
                 # getter, resume as usual
                 return next(*args, **kwargs)
             else:
                 # Setter, only allow to be called once
-                if was_called:
+                # NOTE: The state is kept per instance, since it's the instance storage
+                if var_name in private_vars_table.private_vars:
                     raise Exception(
                         f"Tried to modify a final attribute \"{var_name}\"")
                 else:
-                    was_called = True
                     return next(*args, **kwargs)
         return inner
 
@@ -494,10 +1680,348 @@ class _KisaInternal():
             self._special_attributes_info[special_attr] = Info(required=False,
                                                                default=special_attributes[special_attr],
                                                                final=False,
+                                                               _capture_frame=False,
                                                                _name=special_attr)
         # self._special_attributes['__class__'] = Class
         # self._special_attributes['__classcell__'] = class_desc['__classcell__']
 
+    def _add_instance_cache_to_class(self):
+        if not self._singleton and self._multiton_key is None:
+            return
+
+        multiton_key = self._multiton_key
+        if multiton_key is not None:
+            if multiton_key not in self._vars_info or self._vars_info[multiton_key].static:
+                raise Exception(
+                    f"Unknown multiton key attribute \"{multiton_key}\"")
+
+        clsname = self._private_class_data.class_name
+        cached_instances = self._private_class_data.cached_instances
+        lock = threading.Lock()
+        create_instance = self._class_attrs['__new__']
+        construct_instance = self._class_attrs['__init__']
+
+        def cached_new(cls, *args, **kwargs):
+            if cls is not self._created_class:
+                # Extending class, which is not cached itself
+                return create_instance(cls, *args, **kwargs)
+
+            if multiton_key is None:
+                key = None
+            elif multiton_key in kwargs:
+                key = kwargs[multiton_key]
+            else:
+                raise Exception(
+                    f"\"{multiton_key}\" is Missing in instance creation for class {clsname}")
+
+            instance = cached_instances.get(key)
+            if instance is not None:
+                return instance
+
+            with lock:
+                instance = cached_instances.get(key)
+                if instance is None:
+                    # NOTE: The instance is fully constructed before it is published,
+                    #       so other threads never see a half initialized instance
+                    instance = create_instance(cls, *args, **kwargs)
+                    construct_instance(instance, *args, **kwargs)
+                    cached_instances[key] = instance
+            return instance
+
+        def cached_init(class_self, *args, **kwargs):
+            # Cached instances are constructed once, inside __new__
+            pass
+
+        self._class_attrs['__new__'] = cached_new
+        self._class_attrs['__init__'] = cached_init
+
+    def _add_instance_pool_to_class(self):
+        if self._pool_size is None:
+            return
+
+        def reset_instance(instance):
+            # NOTE: The private storage itself is kept and reused by the next constructor
+            self._unindex_instance(instance)
+            private_data = self._get_private_vars(instance)
+            # NOTE: Otherwise the stale entries keep counting against the lazy cache budget
+            _KisaInternal._static_lazy_cache.discard_instance(instance, private_data.private_vars)
+            private_data.reset()
+            if self._private_class_data.descriptors:
+                # The values were kept in the instance __dict__, along with the private storage
+                vars(instance)[self._obj_private_vars_name] = private_data
+
+        pool = _ObjectPool(size=self._pool_size, reset=reset_instance)
+        self._private_class_data.pool = pool
+        create_instance = self._class_attrs['__new__']
+
+        def pooled_new(cls, *args, **kwargs):
+            if cls is self._created_class:
+                instance = pool.acquire()
+                if instance is not None:
+                    return instance
+            return create_instance(cls, *args, **kwargs)
+
+        self._class_attrs['__new__'] = pooled_new
+
+    def _add_trusted_constructor_to_class(self):
+        if self._private_class_data.kisa_class_type is not Class or 'from_trusted' in self._class_attrs:
+            return
+
+        def from_trusted(cls, **kwargs):
+            trusted_construction = _KisaInternal._static_trusted_construction
+            trusted_construction.trusted = True
+            try:
+                return cls(**kwargs)
+            finally:
+                trusted_construction.__dict__.pop("trusted", None)
+
+        self._class_attrs['from_trusted'] = classmethod(from_trusted)
+
+    def _add_comparison_methods_to_class(self):
+        if self._private_class_data.eq and not self._intern:
+            # NOTE: Interned instances are equal only to themselves, so identity
+            #       equality and hash are kept
+            self._add_equality_methods_to_class()
+        if self._private_class_data.order:
+            self._add_order_methods_to_class()
+
+    def _add_equality_methods_to_class(self):
+        get_values = self._get_values
+        values_getter = self._values_getter
+        private_vars_name = self._obj_private_vars_name
+
+        def kisa_eq(class_self, other):
+            if class_self is other:
+                return True
+            if other.__class__ is not class_self.__class__:
+                return NotImplemented
+            try:
+                # NOTE: Inlined fast path of _get_values, for when all of the values are loaded
+                return values_getter(class_self.__dict__[private_vars_name].private_vars) == \
+                    values_getter(other.__dict__[private_vars_name].private_vars)
+            except KeyError:
+                return get_values(class_self) == get_values(other)
+
+        if self._private_class_data.is_frozen:
+            def kisa_hash(class_self):
+                private_data = self._get_private_vars(class_self)
+                if private_data.cached_hash is None:
+                    private_data.cached_hash = hash(get_values(class_self))
+                return private_data.cached_hash
+        elif self._hash:
+            # NOTE: Not cached, since the values may change
+            def kisa_hash(class_self):
+                return hash(get_values(class_self))
+        else:
+            # Mutable instances are unhashable, as with dataclasses
+            kisa_hash = None
+
+        self._class_attrs['__eq__'] = kisa_eq
+        self._class_attrs['__hash__'] = kisa_hash
+
+    def _add_order_methods_to_class(self):
+        get_values = self._get_values
+        values_getter = self._values_getter
+        private_vars_name = self._obj_private_vars_name
+
+        def gen_compare(compare):
+            def inner(class_self, other):
+                if other.__class__ is not class_self.__class__:
+                    return NotImplemented
+                try:
+                    return compare(values_getter(class_self.__dict__[private_vars_name].private_vars),
+                                   values_getter(other.__dict__[private_vars_name].private_vars))
+                except KeyError:
+                    return compare(get_values(class_self), get_values(other))
+            return inner
+
+        self._class_attrs['__lt__'] = gen_compare(operator.lt)
+        self._class_attrs['__le__'] = gen_compare(operator.le)
+        self._class_attrs['__gt__'] = gen_compare(operator.gt)
+        self._class_attrs['__ge__'] = gen_compare(operator.ge)
+
+    def _add_copy_methods_to_class(self):
+        if self._private_class_data.kisa_class_type is not Class:
+            return
+
+        def kisa_reduce(class_self):
+            values = self._get_loaded_values(class_self)
+            if self._singleton or self._multiton_key is not None or self._intern:
+                return _restore_instance, (class_self.__class__, values)
+            # NOTE: The values are set after the instance is created (and memoized by pickle),
+            #       for values referencing the instance
+            return _restore_instance, (class_self.__class__,), values
+
+        def kisa_setstate(class_self, values):
+            self._get_private_vars(class_self).private_vars.update(values)
+            self._index_instance(class_self)
+
+        def kisa_copy(class_self):
+            return self._copy_instance(class_self)
+
+        def kisa_deepcopy(class_self, memo):
+            return self._copy_instance(class_self, memo)
+
+        copy_methods = {'__reduce__': kisa_reduce,
+                        '__setstate__': kisa_setstate,
+                        '__copy__': kisa_copy,
+                        '__deepcopy__': kisa_deepcopy}
+        for method_name, method in copy_methods.items():
+            if method_name not in self._class_attrs:
+                self._class_attrs[method_name] = method
+
+    def _add_index_queries_to_class(self):
+        indexes = self._private_class_data.indexes
+        if len(indexes) == 0:
+            return
+
+        def get_index(var_name) -> _AttributeIndex:
+            index = indexes.get(var_name)
+            if index is None:
+                raise Exception(f"Attribute \"{var_name}\" is not indexed")
+            return index
+
+        def find(cls, **values):
+            if len(values) == 0:
+                raise Exception("Expected attributes values to find")
+
+            instances = None
+            for var_name, var_value in values.items():
+                found = get_index(var_name).find(var_value)
+                if instances is None:
+                    # NOTE: Inherited indexes hold the instances of the extended class as well
+                    instances = [instance for instance in found if isinstance(instance, cls)]
+                else:
+                    found_ids = set(map(id, found))
+                    instances = [instance for instance in instances if id(instance) in found_ids]
+            return instances
+
+        def find_range(cls, attribute_name: str, low=None, high=None):
+            index = get_index(attribute_name)
+            if not index.is_sorted:
+                raise Exception(f"Attribute \"{attribute_name}\" has no sorted index")
+            return [instance for instance in index.find_range(low, high)
+                    if isinstance(instance, cls)]
+
+        for method_name, method in {'find': find, 'find_range': find_range}.items():
+            if method_name not in self._class_attrs:
+                self._class_attrs[method_name] = classmethod(method)
+
+    def _get_loaded_values(self, class_self) -> Dict[str, any]:
+        # NOTE: Lazy attributes which weren't loaded yet are left out, and loaded when accessed
+        private_vars = self._get_private_vars(class_self).private_vars
+        return {var_name: private_vars[var_name]
+                for var_name in self._private_class_data.instance_vars_names
+                if var_name in private_vars}
+
+    def _restore_instance(self, values: Dict[str, any] = None):
+        if self._singleton or self._multiton_key is not None:
+            # Restored to the instance cached by this process
+            return self._created_class(**values)
+
+        # NOTE: The values were validated when set, so the constructor is not called
+        restored = object.__new__(self._created_class)
+        self._create_private_vars(restored)
+        if values is None:
+            # The values are set later, by __setstate__
+            return restored
+        self._get_private_vars(restored).private_vars.update(values)
+        self._index_instance(restored)
+        return self._intern_instance(restored)
+
+    def _copy_instance(self, class_self, memo: Dict[int, any] = None):
+        if self._singleton or self._multiton_key is not None:
+            # Cached instances are unique, so they are their own copy
+            return class_self
+
+        copied = object.__new__(self._created_class)
+        self._create_private_vars(copied)
+        values = self._get_loaded_values(class_self)
+        if memo is not None:
+            import copy
+            # NOTE: Memoized before the values are copied, for values referencing the instance
+            memo[id(class_self)] = copied
+            values = copy.deepcopy(values, memo)
+        self._get_private_vars(copied).private_vars.update(values)
+        self._index_instance(copied)
+        self._cache_copied_lazy_values(class_self, copied)
+        return self._intern_instance(copied)
+
+    def _cache_copied_lazy_values(self, class_self, copied, changed_vars_names=()):
+        # Values computed from default are evictable by the copy as well, set values are kept
+        lazy_cache = _KisaInternal._static_lazy_cache
+        copied_vars = self._get_private_vars(copied).private_vars
+        for var_name in self._evictable_vars_names:
+            if var_name in copied_vars and var_name not in changed_vars_names and \
+                    lazy_cache.contains(class_self, var_name):
+                lazy_cache.add(copied, var_name, copied_vars[var_name])
+
+    def _index_instance(self, class_self):
+        # Indexes values which were set directly, not by the setters
+        private_vars = self._get_private_vars(class_self).private_vars
+        for var_name, index in self._private_class_data.indexes.items():
+            if var_name in private_vars:
+                index.update(class_self, _NotLoaded, private_vars[var_name])
+
+    def _unindex_instance(self, class_self):
+        private_vars = self._get_private_vars(class_self).private_vars
+        for var_name, index in self._private_class_data.indexes.items():
+            if var_name in private_vars:
+                index.remove(class_self, private_vars[var_name])
+
+    def _add_instance_interning_to_class(self):
+        if not self._intern:
+            return
+
+        interned_instances = weakref.WeakValueDictionary()
+        self._private_class_data.interned_instances = interned_instances
+        lock = threading.Lock()
+        create_instance = self._class_attrs['__new__']
+        construct_instance = self._class_attrs['__init__']
+
+        def interned_new(cls, *args, **kwargs):
+            if cls is not self._created_class:
+                return create_instance(cls, *args, **kwargs)
+
+            # NOTE: The values are known only after construction, so the instance
+            #       is constructed here and dropped if an equal instance exists
+            instance = create_instance(cls, *args, **kwargs)
+            construct_instance(instance, *args, **kwargs)
+            return intern_instance(instance)
+
+        def intern_instance(instance):
+            values = self._get_values(instance)
+
+            with lock:
+                interned_instance = interned_instances.get(values)
+                if interned_instance is None:
+                    interned_instances[values] = instance
+                    interned_instance = instance
+            return interned_instance
+
+        def interned_init(class_self, *args, **kwargs):
+            # Interned instances are constructed inside __new__
+            pass
+
+        self._intern_instance = intern_instance
+        self._class_attrs['__new__'] = interned_new
+        self._class_attrs['__init__'] = interned_init
+
+    def _get_values(self, class_self) -> tuple:
+        private_vars = self._get_private_vars(class_self).private_vars
+        try:
+            return self._values_getter(private_vars)
+        except KeyError:
+            pass
+
+        values = []
+        for var_name in self._private_class_data.instance_vars_names:
+            if var_name not in private_vars:
+                # Lazy attribute, compute it via getter
+                self._private_class_data.accessors[var_name](class_self)
+            values.append(private_vars[var_name])
+        return tuple(values)
+
     def _gen_class_new_method(self):
         def inner(cls, *args, **kwargs):
             extends_class = self._private_class_data.extends_class
@@ -511,6 +2035,9 @@ class _KisaInternal():
     def _handle_class_created(self):
         _KisaInternal._add_class_kisa(self._created_class)
         _KisaInternal._static_classes_data[self._created_class] = self._private_class_data
+        self._private_class_data.set_attribute_value = self._set_attribute_value
+        self._private_class_data.evolve = self._evolve
+        self._private_class_data.kisa_internal = self
 
         self._setup_static_attributes()
 
@@ -570,20 +2097,27 @@ class _KisaInternal():
                 required_info = required_table[name]
 
                 if type(cur_attribute_modifier) is _BeforeClass:
-                    required_list = required_info.before
+                    add_modifier = required_info.add_before
                 elif type(cur_attribute_modifier) is _AroundClass:
-                    required_list = required_info.around
+                    add_modifier = required_info.add_around
                 elif type(cur_attribute_modifier) is _AfterClass:
-                    required_list = required_info.after
+                    add_modifier = required_info.add_after
                 else:
                     raise Exception(
                         f"Unknown modifier type for \"{name}\"")
 
-                callback = cur_attribute_modifier.gen_callback(required_info)
-                required_list.append(callback)
+                add_modifier(cur_attribute_modifier.gen_callback(required_info))
 
+        accessors = self._private_class_data.accessors
         for inherit_modifier in self._inherit_attribute_modifiers.keys():
             info = self._inherit_attribute_modifiers[inherit_modifier]
+            if self._private_class_data.descriptors and inherit_modifier in accessors:
+                # NOTE: The inherited descriptor returns the value, so the inherited accessor is called
+                accessors[inherit_modifier] = self._gen_class_method(inherit_modifier,
+                                                                     accessors[inherit_modifier],
+                                                                     info)
+                self._private_class_data.direct_attributes.discard(inherit_modifier)
+                continue
             self._class_attrs[inherit_modifier] = self._gen_class_method(inherit_modifier,
                                                                          self._gen_inherite_attribute_call(
                                                                              inherit_modifier),
@@ -596,7 +2130,10 @@ class _KisaInternal():
             # NOTE: Don't allow python special methods to be modified unless we support them
             # TODO: theoretically, there shouldn't be a problem to override these.
             #       check and remove if found unnecessary
-            if re.match("^__.+__$", attr_name) and attr_name not in self._special_attributes_info:
+            if _is_special_attribute_name(attr_name) and attr_name not in self._special_attributes_info:
+                if attr_name in ("__module__", "__qualname__"):
+                    # NOTE: Kept so the class is found by its module (e.g. by pickle)
+                    self._class_attrs[attr_name] = class_desc[attr_name]
                 # Python unmodified special attributes, skip!
                 continue
 
@@ -609,17 +2146,27 @@ class _KisaInternal():
                 self._funcs_info[attr_name] = Info(required=False,
                                                    default=attr_value,
                                                    final=True,
+                                                   _capture_frame=False,
                                                    _name=attr_name)
             elif isinstance(attr_value, Info):
                 attr_value._name = attr_name
                 self._vars_info[attr_name] = attr_value
             elif isinstance(attr_value, _AttributeModifier):
                 continue
+            elif isinstance(attr_value, _MemoizedMethod):
+                self._private_class_data.memoized_methods[attr_name] = attr_value
+                self._funcs_info[attr_name] = Info(required=False,
+                                                   default=self._gen_memoized_method(
+                                                       attr_value),
+                                                   final=True,
+                                                   _capture_frame=False,
+                                                   _name=attr_name)
             elif isinstance(attr_value, _StaticClass):
                 self._funcs_info[attr_name] = Info(required=False,
                                                    default=attr_value.callback,
                                                    final=True,
                                                    _static=True,
+                                                   _capture_frame=False,
                                                    _name=attr_name)
             elif not self._private_class_data.is_unknown_attribute_type_valid(attr_name, attr_value):
                 raise Exception(
@@ -646,10 +2193,11 @@ class _KisaInternal():
         self._funcs_info[self._super_name] = Info(required=False,
                                                   default=self._get_super,
                                                   final=True,
+                                                  _capture_frame=False,
                                                   _name=self._super_name)
 
     def _gen_class_constructor(self, clsname):
-        def internal_constructor(class_self, user_attributes_map):
+        def internal_constructor(class_self, user_attributes_map, trusted=False):
             super_args = {}
             for given_var in user_attributes_map.keys():
                 if given_var not in self._vars_info:
@@ -659,7 +2207,7 @@ class _KisaInternal():
 
                 _KisaInternal \
                     ._get_class_private_data(self._private_class_data.extends_class) \
-                    .internal_constructor(class_self, super_args)
+                    .internal_constructor(class_self, super_args, trusted)
             else:
                 super(self._created_class, class_self).__init__(**super_args)
 
@@ -668,6 +2216,11 @@ class _KisaInternal():
             for required_var in self._vars_info.keys():
                 if self._vars_info[required_var].static:
                     continue
+                elif self._vars_info[required_var].computed:
+                    if required_var in user_attributes_map:
+                        raise Exception(
+                            f"Can't set computed attribute \"{required_var}\" in instance creation for class {clsname}")
+                    continue
                 elif required_var in user_attributes_map:
                     var_value = user_attributes_map[required_var]
                 elif self._vars_info[required_var].required:
@@ -680,7 +2233,7 @@ class _KisaInternal():
                     continue
 
                 # Set default value via setter
-                getattr(class_self, required_var)(var_value)
+                self._set_attribute_value(class_self, required_var, var_value, trusted)
 
             for default_var in default_attributes:
                 if default_var in self._get_private_vars(class_self).private_vars:
@@ -690,36 +2243,56 @@ class _KisaInternal():
                 var_value = self._get_default_value(default_var,
                                                     class_self=class_self)
                 # Set default value via setter
-                getattr(class_self, default_var)(var_value)
+                self._set_attribute_value(class_self, default_var, var_value, trusted)
 
         self._private_class_data.internal_constructor = internal_constructor
 
         def class_constructor(class_self, **kwargs):
+            # NOTE: Consumed here, so nested constructions are not trusted
+            trusted = _KisaInternal._static_trusted_construction.__dict__.pop(
+                "trusted", False)
+
             # NOTE: We create this since it's required in here as well
             self._create_private_vars(class_self)
 
             self._on_external_constructor_called(class_self)
             self._private_class_data.internal_constructor(class_self=class_self,
-                                                          user_attributes_map=kwargs)
+                                                          user_attributes_map=kwargs,
+                                                          trusted=trusted)
+            # New instances start with no changes
+            self._get_private_vars(class_self).clear_changes()
 
         return class_constructor
 
     def _get_default_value(self, required_var: str, class_self):
-        if callable(self._vars_info[required_var].default):
-            args = []
+        return self._default_factories[required_var](class_self)
 
-            default_method: Callable = self._vars_info[required_var].default
-            default_args = inspect.getfullargspec(default_method)
-            default_require_self = len(default_args.args) > 0 or \
-                default_args.varargs is not None
+    @staticmethod
+    def _gen_default_factory(info: Info) -> Callable[[any], any]:
+        default = info.default
+        if not callable(default):
+            factory = lambda _class_self: default
+        elif _KisaInternal._is_default_require_self(default):
+            factory = default
+        else:
+            factory = lambda _class_self: default()
 
-            if default_require_self:
-                args.append(class_self)
+        if isinstance(info, StreamInfo):
+            return info.gen_stream_factory(factory)
+        return factory
 
-            var_value = default_method(*args)
-        else:
-            var_value = self._vars_info[required_var].default
-        return var_value
+    @staticmethod
+    def _is_default_require_self(default: Callable) -> bool:
+        if isinstance(default, types.FunctionType):
+            # Fast path for functions/lambdas, avoids importing inspect
+            default_code = default.__code__
+            return default_code.co_argcount > 0 or \
+                bool(default_code.co_flags & _CO_VARARGS)
+
+        import inspect
+        default_args = inspect.getfullargspec(default)
+        return len(default_args.args) > 0 or \
+            default_args.varargs is not None
 
     def _gen_class_getter(self):
         def class_getter(class_self, key):
@@ -728,8 +2301,11 @@ class _KisaInternal():
         return class_getter
 
     def _gen_class_setter(self):
+        if self._private_class_data.descriptors:
+            return self._gen_descriptors_class_setter()
+
         def class_setter(class_self, key: str, val):
-            if key not in self._vars_info and key not in self.all_funcs_info:
+            if not self._is_declared_attribute(key):
                 raise Exception(f"Unknown attribute \"{key}\"")
             else:
                 raise Exception(
@@ -737,10 +2313,38 @@ class _KisaInternal():
 
         return class_setter
 
-    def _gen_attribute_get_set(self, var_name):
+    def _gen_descriptors_class_setter(self):
+        accessors = self._private_class_data.accessors
+
+        def class_setter(class_self, key: str, val):
+            accessor = accessors.get(key)
+            if accessor is None:
+                raise Exception(f"Unknown attribute \"{key}\"")
+            accessor(class_self, val)
+
+        return class_setter
+
+    def _is_declared_attribute(self, key: str) -> bool:
+        # Attribute or method declared by the class, or by the classes it extends
+        for class_data in _KisaInternal._get_inheritance_classes_data(self._created_class):
+            if key in class_data.kisa_internal._vars_info or key in class_data.kisa_internal._funcs_info:
+                return True
+        return False
+
+    def _gen_descriptors_class_deleter(self):
+        def class_deleter(class_self, key: str):
+            if not self._is_declared_attribute(key):
+                raise Exception(f"Unknown attribute \"{key}\"")
+            raise Exception(
+                f"Can't modify instance values: Tried to delete \"{key}\"")
+
+        return class_deleter
+
+    def _gen_attribute_get_set(self, var_name, validate=True):
         is_static = self._vars_info[var_name].static
-        allow_none = self._vars_info[var_name].allow_none
-        is_lazy = self._vars_info[var_name].lazy
+        index = None if is_static else self._private_class_data.indexes.get(var_name)
+        evictable = self._vars_info[var_name].evictable
+        lazy_cache = _KisaInternal._static_lazy_cache
 
         def inner(*args):
             args = [*args]
@@ -754,37 +2358,269 @@ class _KisaInternal():
 
             if len(args) == 0:
                 # get value
-                if var_name not in private_vars_table.private_vars and var_name in self._vars_info:
-                    var_value = self._get_default_value(var_name,
-                                                        class_self=class_self)
+                if not is_static and private_vars_table.computing:
+                    # Read by a computed attribute
+                    private_vars_table.computing[-1].add(var_name)
+
+                if evictable:
+                    return self._get_evictable_value(class_self, private_vars_table, var_name)
 
-                    # Set default value via setter
-                    getattr(class_self, var_name)(var_value)
+                if var_name not in private_vars_table.private_vars and var_name in self._vars_info:
+                    self._set_lazy_value(class_self, var_name)
 
                 return private_vars_table.private_vars[var_name]
             else:
                 # set value
                 val = args[0]
 
-                var_type = self._vars_info[var_name].get_type()
-                if var_type is any:
-                    is_valid_type = True
-                else:
-                    try:
-                        is_valid_type = isinstance(val, var_type)
-                    except Exception as e:
-                        raise Exception(
-                            f"An error when comparing types: \"{var_name}\" to class \"{var_type}\" :: {e}")
-
-                if not is_valid_type:
-                    if not (allow_none and val is None):
-                        raise Exception(
-                            f"\"{var_name}\" must be of type: {var_type}")
+                if validate:
+                    self._validate_type(var_name, val)
+                if evictable:
+                    # Set values aren't computed from the default, so they aren't evictable
+                    lazy_cache.discard(class_self, var_name)
+                if index is not None:
+                    index.update(class_self,
+                                 private_vars_table.private_vars.get(var_name, _NotLoaded),
+                                 val)
                 private_vars_table.private_vars[var_name] = val
+                if not is_static:
+                    if private_vars_table.changed_fields is not None:
+                        private_vars_table.changed_fields.add(var_name)
+                    if private_vars_table.dependents:
+                        private_vars_table.invalidate(var_name)
+                    if private_vars_table.memoized:
+                        private_vars_table.memoized.clear()
                 return val
 
         return inner
 
+    def _gen_static_attribute_get_set(self, var_name, validate=True, final=False):
+        private_vars = self._private_class_data.private_vars
+
+        def inner(*args):
+            if len(args) == 0:
+                try:
+                    return private_vars[var_name]
+                except KeyError:
+                    self._set_lazy_value(self._created_class, var_name)
+                    return private_vars[var_name]
+
+            val = args[0]
+            if final and var_name in private_vars:
+                raise Exception(
+                    f"Tried to modify a final attribute \"{var_name}\"")
+            if validate:
+                self._validate_type(var_name, val)
+            private_vars[var_name] = val
+            return val
+
+        return inner
+
+    def _validate_type(self, var_name, val):
+        validator = self._validators.get(var_name)
+        if validator is None:
+            # NOTE: String types are resolved, and compiled, only when first required
+            validator = self._compile_attribute_validator(var_name)
+
+        try:
+            is_valid_type = validator(val)
+        except Exception as e:
+            raise Exception(
+                f"An error when comparing types: \"{var_name}\" to class \"{self._vars_info[var_name].get_type()}\" :: {e}")
+
+        if not is_valid_type:
+            if not (self._vars_info[var_name].allow_none and val is None):
+                raise Exception(
+                    f"\"{var_name}\" must be of type: {self._vars_info[var_name].get_type()}")
+
+    def _compile_attribute_validator(self, var_name):
+        info = self._vars_info[var_name]
+        validator = _compile_validator(info.get_type(),
+                                       resolve_type=info._get_type_from_string,
+                                       check_items=info.check_items,
+                                       check_depth=info.check_depth)
+        self._validators[var_name] = validator
+        return validator
+
+    def _gen_memoized_method(self, memoized: _MemoizedMethod):
+        callback = memoized.callback
+        maxsize = memoized.maxsize
+
+        def inner(class_self, *args, **kwargs):
+            private_data = self._get_private_vars(class_self)
+            if private_data.memoized is None:
+                private_data.memoized = {}
+
+            cache = private_data.memoized.get(memoized)
+            if cache is None:
+                cache = collections.OrderedDict()
+                private_data.memoized[memoized] = cache
+
+            if len(kwargs) == 0:
+                key = args
+            else:
+                key = (args, tuple(sorted(kwargs.items())))
+
+            if key in cache:
+                memoized.hits += 1
+                cache.move_to_end(key)
+                return cache[key]
+
+            memoized.misses += 1
+            retval = callback(class_self, *args, **kwargs)
+            cache[key] = retval
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return retval
+
+        return inner
+
+    def _gen_computed_attribute_get(self, var_name):
+        validate = self._validation_mode == "full"
+
+        def inner(class_self, *args):
+            if len(args) > 0:
+                raise Exception(
+                    f"Can't modify computed attribute \"{var_name}\"")
+
+            private_data = self._get_private_vars(class_self)
+            if private_data.computing:
+                # Read by another computed attribute
+                private_data.computing[-1].add(var_name)
+
+            computed_values = private_data.computed_values
+            if var_name in computed_values:
+                return computed_values[var_name]
+
+            private_data.computing.append(set())
+            try:
+                var_value = self._get_default_value(var_name,
+                                                    class_self=class_self)
+            finally:
+                dependencies = private_data.computing.pop()
+
+            if validate:
+                self._validate_type(var_name, var_value)
+            computed_values[var_name] = var_value
+            for dependency in dependencies:
+                private_data.dependents.setdefault(
+                    dependency, set()).add(var_name)
+
+            return var_value
+
+        return inner
+
+    def _gen_frozen_attribute_get(self, var_name):
+        evictable = self._vars_info[var_name].evictable
+
+        def inner(class_self, *args):
+            if len(args) > 0:
+                raise Exception(
+                    f"Can't modify frozen attribute \"{var_name}\"")
+
+            private_data = self._get_private_vars(class_self)
+            if private_data.computing:
+                # Read by a computed attribute
+                private_data.computing[-1].add(var_name)
+
+            if evictable:
+                return self._get_evictable_value(class_self, private_data, var_name)
+
+            private_vars = private_data.private_vars
+            if var_name not in private_vars:
+                # Lazy attribute
+                self._set_lazy_value(class_self, var_name)
+
+            return private_vars[var_name]
+
+        return inner
+
+    def _get_evictable_value(self, class_self, private_data: _PrivateObjectData, var_name: str):
+        var_value = private_data.private_vars.get(var_name, _NotLoaded)
+        if var_value is not _NotLoaded:
+            _KisaInternal._static_lazy_cache.touch(class_self, var_name)
+            return var_value
+
+        set_value = self._set_lazy_value(class_self, var_name)
+        var_value = private_data.private_vars.get(var_name, _NotLoaded)
+        # NOTE: May be evicted already by another thread
+        return set_value if var_value is _NotLoaded else var_value
+
+    def _set_lazy_value(self, class_self, var_name):
+        var_value = self._get_default_value(var_name,
+                                            class_self=class_self)
+        return self._store_lazy_value(class_self, var_name, var_value)
+
+    def _store_lazy_value(self, class_self, var_name, var_value):
+        if self._vars_info[var_name].static:
+            changed_fields = None
+        else:
+            changed_fields = self._get_private_vars(class_self).changed_fields
+
+        # NOTE: Computing a lazy value is not considered a change
+        was_changed = changed_fields is not None and var_name in changed_fields
+
+        # Set default value via setter
+        set_value = self._set_attribute_value(class_self, var_name, var_value)
+
+        if changed_fields is not None and not was_changed:
+            changed_fields.discard(var_name)
+
+        if self._vars_info[var_name].evictable:
+            # NOTE: Added after it's set, since setting the attribute removes it from the cache
+            private_vars = self._get_private_vars(class_self).private_vars
+            if var_name in private_vars:
+                _KisaInternal._static_lazy_cache.add(class_self, var_name, private_vars[var_name])
+        return set_value
+
+    def _set_attribute_value(self, class_self, var_name, var_value, trusted=False):
+        if trusted and var_name in self._trusted_setters:
+            trusted_setter = self._trusted_setters[var_name]
+            if trusted_setter is None:
+                trusted_setter = self._gen_class_method(var_name,
+                                                        self._gen_attribute_get_set(var_name, validate=False),
+                                                        self._vars_info[var_name])
+                self._trusted_setters[var_name] = trusted_setter
+            return trusted_setter(class_self, var_value)
+        elif var_name in self._internal_setters:
+            return self._internal_setters[var_name](class_self, var_value)
+        elif var_name not in self._vars_info and _KisaInternal._is_class_kisa(self._private_class_data.extends_class):
+            # Inherited attribute, let the declaring class set it
+            return _KisaInternal \
+                ._get_class_private_data(self._private_class_data.extends_class) \
+                .set_attribute_value(class_self, var_name, var_value, trusted)
+        elif self._private_class_data.descriptors and var_name in self._private_class_data.accessors:
+            return self._private_class_data.accessors[var_name](class_self, var_value)
+        return getattr(class_self, var_name)(var_value)
+
+    def _evolve(self, class_self, changes: Dict[str, any]):
+        if self._singleton or self._multiton_key is not None:
+            raise Exception(
+                f"Can't evolve instance of cached class \"{self._private_class_data.class_name}\"")
+
+        instance_vars_names = self._private_class_data.instance_vars_names
+        for var_name in changes.keys():
+            if var_name not in instance_vars_names:
+                raise Exception(f"Unknown attribute \"{var_name}\"")
+
+        # NOTE: The constructor is not called, unchanged values are copied as is
+        #       and only the changed values go through the setters
+        evolved = object.__new__(self._created_class)
+        self._create_private_vars(evolved)
+        evolved_vars = self._get_private_vars(evolved).private_vars
+        private_vars = self._get_private_vars(class_self).private_vars
+        for var_name in instance_vars_names:
+            if var_name in private_vars and var_name not in changes:
+                evolved_vars[var_name] = private_vars[var_name]
+
+        for var_name, var_value in changes.items():
+            self._set_attribute_value(evolved, var_name, var_value)
+        self._get_private_vars(evolved).clear_changes()
+        self._index_instance(evolved)
+        self._cache_copied_lazy_values(class_self, evolved, changes)
+
+        return self._intern_instance(evolved)
+
     def _gen_inherite_attribute_call(self, attribute_name):
         def inner(class_self, *args, **kwargs):
             attribute = getattr(
@@ -792,7 +2628,62 @@ class _KisaInternal():
             return attribute(*args, **kwargs)
         return inner
 
-    def _gen_class_method(self, method_name, callback, method_info: ModifiersList):
+    def _get_trace_rate(self, attribute_name: str) -> float:
+        if attribute_name in self._trace_rates:
+            return self._trace_rates[attribute_name]
+        elif attribute_name in self._vars_info or attribute_name == self._super_name:
+            # NOTE: Attributes are traced only when named explicitly
+            return None
+        elif attribute_name in self._funcs_info or attribute_name == "__init__":
+            return self._trace_rates.get(None)
+        return None
+
+    def _gen_traced_class_method(self, method_name, callback, method_info: ModifiersList, sample_rate: float):
+        tracer = _KisaInternal._static_tracer
+        span_name = f"{self._private_class_data.class_name}.{method_name}"
+
+        def gen_traced(traced_callback, kind, rate=None):
+            modifier_name = None if kind in ("method", "call") else \
+                getattr(traced_callback, "__name__", repr(traced_callback))
+
+            def traced(*args, **kwargs):
+                span = tracer.start(span_name, kind, modifier_name, rate)
+                if span is None:
+                    return traced_callback(*args, **kwargs)
+                try:
+                    return traced_callback(*args, **kwargs)
+                except BaseException as e:
+                    span["error"] = repr(e)
+                    raise
+                finally:
+                    tracer.end(span)
+            return traced
+
+        if method_info.has_modifiers():
+            callback = gen_traced(callback, "call")
+            method_info = ModifiersList(before=[gen_traced(modifier, "before") for modifier in method_info.before],
+                                        around=[gen_traced(modifier, "around") for modifier in method_info.around],
+                                        after=[gen_traced(modifier, "after") for modifier in method_info.after],
+                                        static=method_info.static)
+
+        method = self._gen_class_method(method_name, callback, method_info, trace=False)
+        if method_info.static:
+            return staticmethod(gen_traced(method.__func__, "method", sample_rate))
+        return gen_traced(method, "method", sample_rate)
+
+    def _gen_class_method(self, method_name, callback, method_info: ModifiersList, trace=True):
+        sample_rate = self._get_trace_rate(method_name) if trace else None
+        if sample_rate is not None:
+            return self._gen_traced_class_method(method_name, callback, method_info, sample_rate)
+
+        if not method_info.has_modifiers():
+            # Fast path, no modifiers to call around the callback
+            if method_info.static:
+                return staticmethod(callback)
+            elif isinstance(callback, types.FunctionType):
+                # NOTE: Other callables (e.g. bound methods) aren't bound to the instance as methods
+                return callback
+
         def inner(*args, **kwargs):
             args = [*args]
             class_self = None
@@ -832,14 +2723,25 @@ class _KisaInternal():
             return retval
 
         if method_info.static:
-            return staticmethod(lambda *args, **kwargs: inner(*args, **kwargs))
+            return staticmethod(inner)
         else:
             return inner
 
     def _create_private_vars(self, class_self):
         if not hasattr(class_self, self._obj_private_vars_name):
             private_vars = _PrivateObjectData()
+            if self._private_class_data.descriptors:
+                # NOTE: The values are kept in the instance __dict__, where Python reads them directly
+                private_vars.private_vars = vars(class_self)
+            if self._private_class_data.track_changes:
+                private_vars.changed_fields = set()
+            if self._private_class_data.has_computed:
+                private_vars.computed_values = {}
+                private_vars.dependents = {}
+                private_vars.computing = []
             vars(class_self)[self._obj_private_vars_name] = private_vars
+            if self._private_class_data.live_instances is not None:
+                self._private_class_data.live_instances.add(class_self)
 
     def _get_private_vars(self, class_self) -> _PrivateObjectData:
         return getattr(class_self, self._obj_private_vars_name)
@@ -861,6 +2763,33 @@ class _KisaInternal():
             raise Exception(
                 f"Can't extend {extends_class}")
 
+        if _KisaInternal._is_class_kisa(extends_class):
+            extends_class_data = _KisaInternal._get_class_private_data(
+                extends_class)
+            if extends_class_data.track_changes:
+                self._private_class_data.track_changes = True
+            if extends_class_data.has_computed:
+                self._private_class_data.has_computed = True
+            if extends_class_data.is_frozen and not self._private_class_data.is_frozen:
+                raise Exception(
+                    f"Non frozen class can't extend frozen class {extends_class}")
+            if self._private_class_data.is_frozen and not extends_class_data.is_frozen \
+                    and len(extends_class_data.instance_vars_names) > 0:
+                raise Exception(
+                    f"Frozen class can't extend non frozen class with attributes {extends_class}")
+            if extends_class_data.eq and not self._intern:
+                self._private_class_data.eq = True
+            if extends_class_data.order:
+                self._private_class_data.order = True
+            if extends_class_data.descriptors:
+                self._private_class_data.descriptors = True
+            elif self._private_class_data.descriptors and len(extends_class_data.instance_vars_names) > 0:
+                raise Exception(
+                    f"Descriptors class can't extend non descriptors class with attributes {extends_class}")
+            self._private_class_data.accessors.update(extends_class_data.accessors)
+            self._private_class_data.indexes.update(extends_class_data.indexes)
+            self._private_class_data.direct_attributes.update(extends_class_data.direct_attributes)
+
         for to_implement_class in self._private_class_data.implemented_interfaces:
             if _KisaInternal._can_class_be_implemented(to_implement_class) is False:
                 raise Exception(
@@ -889,6 +2818,12 @@ class _KisaInternal():
 
         return is_implemented
 
+    @staticmethod
+    def _validate_validation_mode(validation: str):
+        if validation not in _KisaInternal._static_validation_modes:
+            raise Exception(
+                f"Unknown validation mode \"{validation}\", expected one of: {', '.join(_KisaInternal._static_validation_modes)}")
+
     @staticmethod
     def gen_class_id():
         _KisaInternal._static_internal_class_id += 1
@@ -910,17 +2845,1160 @@ class _KisaInternal():
     def _get_class_private_data(kisa_class):
         return _KisaInternal._static_classes_data[kisa_class]
 
+    @staticmethod
+    def _get_instance_private_data(instance) -> _PrivateObjectData:
+        if not _KisaInternal._is_instance_kisa(instance):
+            raise Exception(f"Not a Kisa instance: {instance}")
+        return getattr(instance, _KisaInternal._static_obj_private_vars_name)
+
+    @staticmethod
+    def _get_static_attribute_access(kisa_class, attribute_name: str):
+        # Returns the lock of the static attribute, with its value getter and setter
+        if not _KisaInternal._is_class_kisa(kisa_class):
+            raise Exception(f"Not a Kisa class: {kisa_class}")
+
+        for class_data in _KisaInternal._get_inheritance_classes_data(kisa_class):
+            if attribute_name not in class_data.static_locks:
+                continue
+
+            private_vars = class_data.private_vars
+            accessor = getattr(kisa_class, attribute_name)
+
+            def get_value():
+                if attribute_name not in private_vars:
+                    # Lazy attribute
+                    accessor()
+                # NOTE: The stored value, getter modifiers are only called when set
+                return private_vars[attribute_name]
+
+            return class_data.static_locks[attribute_name], get_value, accessor
+
+        raise Exception(
+            f"\"{attribute_name}\" is not a static attribute of class \"{kisa_class.__name__}\"")
+
+    @staticmethod
+    def _get_instance_size(instance) -> int:
+        # Size of the instance and its Kisa storage, not including the attributes values
+        private_data: _PrivateObjectData = vars(instance)[_KisaInternal._static_obj_private_vars_name]
+        size = sys.getsizeof(instance) + sys.getsizeof(vars(instance)) + \
+            sys.getsizeof(private_data) + sys.getsizeof(vars(private_data))
+        private_vars = private_data.private_vars
+        if private_vars is vars(instance):
+            # Descriptors classes keep the values in the instance __dict__
+            private_vars = None
+        for container in (private_vars,
+                          private_data.changed_fields,
+                          private_data.computed_values,
+                          private_data.dependents,
+                          private_data.computing,
+                          private_data.memoized):
+            if container is not None:
+                size += sys.getsizeof(container)
+        return size
+
+    @staticmethod
+    def _get_class_memory_report(kisa_class) -> Dict[str, any]:
+        class_data = _KisaInternal._get_class_private_data(kisa_class)
+        lazy_vars_names = set()
+        for cur_class_data in _KisaInternal._get_inheritance_classes_data(kisa_class):
+            for var_name, info in cur_class_data.kisa_internal._vars_info.items():
+                if info.lazy and not info.static:
+                    lazy_vars_names.add(var_name)
+
+        lazy_values_bytes = 0
+        for var_name, info in class_data.kisa_internal._vars_info.items():
+            if info.lazy and info.static and var_name in class_data.private_vars:
+                lazy_values_bytes += sys.getsizeof(class_data.private_vars[var_name])
+
+        instances_amount = None
+        bytes_per_instance = None
+        if class_data.live_instances is not None:
+            instances = class_data.live_instances.instances()
+            instances_amount = len(instances)
+            instances_bytes = 0
+            for instance in instances:
+                instances_bytes += _KisaInternal._get_instance_size(instance)
+                private_data = _KisaInternal._get_instance_private_data(instance)
+                for var_name in lazy_vars_names.intersection(private_data.private_vars):
+                    lazy_values_bytes += sys.getsizeof(private_data.private_vars[var_name])
+                if private_data.computed_values:
+                    lazy_values_bytes += sum(sys.getsizeof(value)
+                                             for value in private_data.computed_values.values())
+            bytes_per_instance = instances_bytes // instances_amount if instances_amount > 0 else 0
+
+        # NOTE: Info objects keep the frames of the class declaration, to resolve string types
+        pinned_frames = {}
+        for info in class_data.kisa_internal._vars_info.values():
+            for frame in (info.frame, info._current_frame, info._module_frame):
+                if frame is not None:
+                    pinned_frames[id(frame)] = frame
+
+        return {"class": kisa_class,
+                "instances": instances_amount,
+                "bytes_per_instance": bytes_per_instance,
+                "lazy_values_bytes": lazy_values_bytes,
+                "pinned_frames": len(pinned_frames),
+                "pinned_frames_bytes": sum(sys.getsizeof(frame) for frame in pinned_frames.values())}
+
+    @staticmethod
+    def _gen_sort_key(kisa_class, vars_names: List[str]) -> Callable[[any], any]:
+        if not _KisaInternal._is_class_kisa(kisa_class):
+            raise Exception(f"Not a Kisa class: {kisa_class}")
+
+        class_data = _KisaInternal._get_class_private_data(kisa_class)
+        if len(vars_names) == 0:
+            vars_names = class_data.instance_vars_names
+            if len(vars_names) == 0:
+                raise Exception(f"Class \"{class_data.class_name}\" has no instance attributes")
+        for var_name in vars_names:
+            if var_name not in class_data.instance_vars_names:
+                raise Exception(f"Unknown attribute \"{var_name}\"")
+
+        if class_data.descriptors:
+            # NOTE: Read natively from the instances __dict__, descriptors load the missing values
+            return operator.attrgetter(*vars_names)
+
+        get_values = operator.itemgetter(*vars_names)
+        private_vars_name = _KisaInternal._static_obj_private_vars_name
+        accessors = [class_data.accessors[var_name] for var_name in vars_names]
+
+        def sort_key(instance):
+            private_vars = instance.__dict__[private_vars_name].private_vars
+            try:
+                return get_values(private_vars)
+            except KeyError:
+                # Lazy attributes which weren't loaded yet, load them via their getters
+                for accessor in accessors:
+                    accessor(instance)
+                return get_values(private_vars)
+
+        return sort_key
+
+    @staticmethod
+    def _get_prefetch_tasks(instances, attribute_name: str) -> List[tuple]:
+        # Returns the instances whose lazy attribute wasn't loaded yet, with the generator of its class
+        internals = {}
+        tasks = []
+        prefetched_ids = set()
+        for instance in instances:
+            instance_class = instance.__class__
+            if not _KisaInternal._is_class_kisa(instance_class):
+                raise Exception(f"Can't prefetch non Kisa instance: {instance}")
+            if id(instance) in prefetched_ids:
+                continue
+            prefetched_ids.add(id(instance))
+
+            internal = internals.get(instance_class)
+            if internal is None:
+                internal = _KisaInternal._get_lazy_attribute_internal(instance_class, attribute_name)
+                internals[instance_class] = internal
+            if attribute_name not in _KisaInternal._get_instance_private_data(instance).private_vars:
+                tasks.append((internal, instance))
+        return tasks
+
+    @staticmethod
+    def _get_lazy_attribute_internal(kisa_class, attribute_name: str):
+        # The generator of the class declaring the attribute
+        for class_data in _KisaInternal._get_inheritance_classes_data(kisa_class):
+            info = class_data.kisa_internal._vars_info.get(attribute_name)
+            if info is None:
+                continue
+            if not info.lazy or info.static:
+                raise Exception(f"Attribute \"{attribute_name}\" is not a lazy instance attribute")
+            return class_data.kisa_internal
+        raise Exception(f"Unknown attribute \"{attribute_name}\"")
+
+    @staticmethod
+    def _store_prefetched_value(internal, instance, attribute_name: str, value):
+        if attribute_name in _KisaInternal._get_instance_private_data(instance).private_vars:
+            # Loaded (or set) meanwhile, the first value is kept
+            return
+        internal._store_lazy_value(instance, attribute_name, value)
+
+    @staticmethod
+    def _pack_instances(instances) -> tuple:
+        # Packs the instances by columns, a list of values per attribute of each class,
+        # so the values are pickled together rather than per instance
+        classes = []
+        classes_indexes = {}
+        columns = []
+        instances_classes = []
+        for instance in instances:
+            instance_class = instance.__class__
+            if not _KisaInternal._is_class_kisa(instance_class):
+                raise Exception(f"Can't pack non Kisa instance: {instance}")
+
+            class_index = classes_indexes.get(instance_class)
+            if class_index is None:
+                class_index = len(classes)
+                classes_indexes[instance_class] = class_index
+                classes.append(instance_class)
+                vars_names = _KisaInternal._get_class_private_data(instance_class).instance_vars_names
+                columns.append({var_name: [] for var_name in vars_names})
+            instances_classes.append(class_index)
+
+            private_vars = _KisaInternal._get_instance_private_data(instance).private_vars
+            for var_name, column in columns[class_index].items():
+                column.append(private_vars.get(var_name, _NotLoaded))
+        return classes, columns, instances_classes
+
+    @staticmethod
+    def _unpack_instances(packed: tuple) -> list:
+        classes, columns, instances_classes = packed
+        rows = [zip(*class_columns.values()) if class_columns else itertools.repeat(())
+                for class_columns in columns]
+        restorers = [_KisaInternal._get_class_private_data(kisa_class).kisa_internal._restore_instance
+                     for kisa_class in classes]
+
+        instances = []
+        for class_index in instances_classes:
+            row = next(rows[class_index])
+            vars_names = columns[class_index].keys()
+            instances.append(restorers[class_index]({var_name: value
+                                                     for var_name, value in zip(vars_names, row)
+                                                     if value is not _NotLoaded}))
+        return instances
+
+    @staticmethod
+    def _get_deferred_executor() -> _DeferredExecutor:
+        if _KisaInternal._static_deferred_executor is None:
+            with _KisaInternal._static_deferred_executor_lock:
+                if _KisaInternal._static_deferred_executor is None:
+                    _KisaInternal._static_deferred_executor = _DeferredExecutor(max_pending=1024,
+                                                                                batch_size=64,
+                                                                                overflow="block",
+                                                                                on_error=_report_deferred_error)
+        return _KisaInternal._static_deferred_executor
+
+    @staticmethod
+    def _gen_deferred_callback(callback: Callable) -> Callable:
+        def inner(*args, **kwargs):
+            _KisaInternal._get_deferred_executor().submit(callback, args, kwargs)
+        return inner
+
+    @staticmethod
+    def _get_inheritance_classes_data(kisa_class) -> List[_PrivateClassData]:
+        classes_data = []
+        while _KisaInternal._is_class_kisa(kisa_class):
+            class_data = _KisaInternal._get_class_private_data(kisa_class)
+            classes_data.append(class_data)
+            kisa_class = class_data.extends_class
+        return classes_data
+
+
+class _KisaCompiler():
+    # Emits the source of a module, with its Kisa classes replaced by equivalent plain classes
+
+    _static_indent: str = "    "
+    _static_modifier_types = ("before", "around", "after")
+    _static_unsupported_special_attributes = ("__new__", "__getattribute__", "__setattr__")
+
+    def __init__(self, module: types.ModuleType):
+        import ast
+        import inspect
+
+        self._module: types.ModuleType = module
+        self._source: str = inspect.getsource(module)
+        self._source_lines: List[str] = self._source.splitlines()
+        self._tree = ast.parse(self._source)
+        self._compiled_classes = set()
+
+    def compile(self) -> str:
+        import ast
+
+        replacements = []
+        for node in self._tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            cls = vars(self._module).get(node.name)
+            if not _KisaInternal._is_class_kisa(cls):
+                continue
+
+            start_lineno = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            # NOTE: Class decorators are kept as is
+            decorators_lines = self._source_lines[start_lineno - 1:node.lineno - 1]
+            pre_class_lines, class_lines, post_class_lines = self._compile_class(cls, node)
+            replacements.append((start_lineno,
+                                 node.end_lineno,
+                                 pre_class_lines + decorators_lines + class_lines + post_class_lines))
+            self._compiled_classes.add(cls)
+
+        lines = list(self._source_lines)
+        for start_lineno, end_lineno, compiled_lines in reversed(replacements):
+            lines[start_lineno - 1:end_lineno] = compiled_lines
+        lines = self._remove_unused_kisa_import(lines)
+
+        header = f"# Generated by \"python -m kisa compile {self._module.__name__}\", do not edit"
+        return "\n".join([header, *lines]) + "\n"
+
+    def _compile_class(self, cls, node):
+        class_data: _PrivateClassData = _KisaInternal._get_class_private_data(cls)
+        internal: _KisaInternal = class_data.kisa_internal
+        clsname = class_data.class_name
+        self._validate_class(internal, clsname)
+
+        if _KisaInternal._is_class_kisa(class_data.extends_class):
+            if class_data.extends_class not in self._compiled_classes:
+                self._raise_unsupported(
+                    clsname, f"extends \"{class_data.extends_class.__name__}\", which isn't a Kisa class declared before it in the module")
+            base_name = class_data.extends_class.__name__
+        else:
+            base_name = "object"
+
+        statements = self._get_class_statements(node)
+        modifiers = self._get_modifiers(internal)
+        validate_on_set = internal._validation_mode == "full"
+        validate_on_construct = internal._validation_mode != "off"
+
+        pre_class_lines = []
+        body = []
+        post_class_lines = []
+
+        docstring = self._get_docstring(node)
+        if docstring is not None:
+            body.extend(docstring)
+
+        # NOTE: Modifiers are kept under private names, since they aren't attributes of Kisa classes
+        for attr_name, attr_value in internal._class_desc.items():
+            if isinstance(attr_value, _AttributeModifier):
+                body.append("")
+                body.extend(self._get_function_source(clsname, attr_name, statements, strip_decorator=True))
+                body.append(f"__kisa_modifier_{attr_name} = {attr_name}")
+                body.append(f"del {attr_name}")
+
+        # Names of the attributes consumed by the constructor, including the inherited ones
+        attributes_names = set()
+        for cur_class_data in _KisaInternal._get_inheritance_classes_data(cls):
+            attributes_names.update(cur_class_data.kisa_internal._vars_info.keys())
+        body.append("")
+        body.append(f"__kisa_attributes = frozenset({tuple(sorted(attributes_names))!r})")
+
+        # Attribute name -> (setter used by the constructor, setter used by trusted construction)
+        constructor_setters = {}
+        # Attribute name -> its default value expression
+        defaults = {}
+        for var_name, info in internal._vars_info.items():
+            var_modifiers = modifiers.get(var_name)
+            self._validate_modifiers(clsname, var_name, info, var_modifiers, is_final=info.final)
+            body.append("")
+
+            arguments = self._get_info_arguments(clsname, var_name, info, statements)
+            type_check = self._gen_type_check(clsname, var_name, info, arguments, pre_class_lines)
+            default = self._gen_default(clsname, var_name, arguments, body)
+            defaults[var_name] = default
+
+            if info.static:
+                body.extend(self._gen_static_accessor(clsname,
+                                                      var_name,
+                                                      info,
+                                                      type_check if validate_on_set else [],
+                                                      default,
+                                                      var_modifiers))
+                if not info.lazy:
+                    post_class_lines.append(
+                        f"{clsname}.{var_name}({self._gen_default_value(info, default, clsname)})")
+                continue
+
+            accessors_names = {validate_on_set: var_name}
+            for validate in (validate_on_construct, False):
+                if validate not in accessors_names:
+                    accessors_names[validate] = f"__kisa_{var_name}_{'checked' if validate else 'unchecked'}"
+
+            for validate, accessor_name in accessors_names.items():
+                if accessor_name != var_name:
+                    body.append("")
+                body.extend(self._gen_instance_accessor(clsname,
+                                                        var_name,
+                                                        accessor_name,
+                                                        info,
+                                                        type_check if validate else [],
+                                                        default,
+                                                        var_modifiers,
+                                                        lazy_setter=accessors_names[validate_on_construct]))
+            constructor_setters[var_name] = (accessors_names[validate_on_construct],
+                                             accessors_names[False])
+
+        for func_name, info in internal._funcs_info.items():
+            func_modifiers = modifiers.get(func_name)
+            self._validate_modifiers(clsname, func_name, info, func_modifiers)
+
+            body.append("")
+            if func_name == internal._super_name:
+                body.append(f"def {func_name}(self):")
+                body.append(f"{self._static_indent}return super({clsname}, self)")
+                is_function = True
+            else:
+                body.extend(self._get_function_source(clsname,
+                                                      func_name,
+                                                      statements,
+                                                      strip_decorator=info.static))
+                is_function = info.static or isinstance(info.default, types.FunctionType)
+
+            if func_modifiers is None and is_function:
+                if info.static:
+                    body.append(f"{func_name} = staticmethod({func_name})")
+                continue
+
+            # NOTE: Called via the class, so callables which aren't functions receive self as well
+            body.append(f"__kisa_method_{func_name} = {func_name}")
+            self_arg = "" if info.static else "self, "
+            body.extend(self._gen_modifiers_wrapper(clsname,
+                                                    func_name,
+                                                    func_name,
+                                                    info.static,
+                                                    func_modifiers,
+                                                    f"{clsname}.__kisa_method_{func_name}({self_arg}*args, **kwargs)"))
+
+        body.append("")
+        body.extend(self._gen_constructor(internal, base_name, constructor_setters, defaults, modifiers))
+
+        for attribute_name, info in internal._inherit_attribute_modifiers.items():
+            self._validate_modifiers(clsname, attribute_name, info, modifiers.get(attribute_name))
+            body.extend(self._gen_modifiers_wrapper(clsname,
+                                                    attribute_name,
+                                                    attribute_name,
+                                                    False,
+                                                    modifiers.get(attribute_name),
+                                                    f"super({clsname}, self).{attribute_name}(*args, **kwargs)"))
+
+        # NOTE: The members are separated by an empty line
+        class_lines = [f"class {clsname}({base_name}):", *self._indent(body[1:] if body[0] == "" else body)]
+        return pre_class_lines, class_lines, post_class_lines
+
+    def _validate_class(self, internal: _KisaInternal, clsname: str):
+        class_data = internal._private_class_data
+        unsupported_features = {"singleton": internal._singleton,
+                                "multiton": internal._multiton_key is not None,
+                                "instance pool": internal._pool_size is not None,
+                                "frozen": class_data.is_frozen,
+                                "change tracking": class_data.track_changes,
+                                "computed attributes": class_data.has_computed,
+                                "memoized methods": len(class_data.memoized_methods) > 0,
+                                "descriptors": class_data.descriptors,
+                                "generated comparisons": class_data.eq or class_data.order,
+                                "indexes": len(class_data.indexes) > 0,
+                                "tracing": len(internal._trace_rates) > 0,
+                                "stream attributes": any(isinstance(info, StreamInfo)
+                                                         for info in internal._vars_info.values())}
+        for feature_name, is_used in unsupported_features.items():
+            if is_used:
+                self._raise_unsupported(clsname, f"uses {feature_name}")
+
+        for attr_name, attr_value in internal._class_desc.items():
+            if isinstance(attr_value, _AttributeModifier) and attr_value.callback is None:
+                # e.g. kisa.getter/kisa.setter, which generate the modifier
+                self._raise_unsupported(clsname, f"uses the generated modifier \"{attr_name}\"")
+
+        for special_attr in _KisaCompiler._static_unsupported_special_attributes:
+            info = internal._special_attributes_info[special_attr]
+            if info.before or info.around or info.after:
+                self._raise_unsupported(clsname, f"modifies \"{special_attr}\"")
+
+    def _validate_modifiers(self, clsname: str, attribute_name: str, info: ModifiersList, attribute_modifiers, is_final=False):
+        # NOTE: Only modifiers declared in the class body can be compiled (e.g. not Info(before=...))
+        for modifier_type in _KisaCompiler._static_modifier_types:
+            declared_amount = 0
+            if attribute_modifiers is not None:
+                declared_amount = len(attribute_modifiers[modifier_type])
+            extra_amount = len(getattr(info, modifier_type)) - declared_amount
+
+            # The final attribute check, unless checked by the accessor itself
+            is_final_check = modifier_type == "around" and is_final and extra_amount == 1
+            if extra_amount != 0 and not is_final_check:
+                self._raise_unsupported(
+                    clsname, f"has \"{attribute_name}\" modifiers which aren't declared in the class")
+
+    def _get_modifiers(self, internal: _KisaInternal) -> Dict[str, Dict[str, List[str]]]:
+        # Attribute name -> modifier type -> names of the modifiers, by declaration order
+        modifiers = {}
+        for attr_name, attr_value in internal._class_desc.items():
+            if type(attr_value) is _BeforeClass:
+                modifier_type = "before"
+            elif type(attr_value) is _AroundClass:
+                modifier_type = "around"
+            elif type(attr_value) is _AfterClass:
+                modifier_type = "after"
+            else:
+                continue
+
+            for name in attr_value.modified_attributes:
+                if name not in modifiers:
+                    modifiers[name] = {modifier_type: [] for modifier_type in _KisaCompiler._static_modifier_types}
+                modifiers[name][modifier_type].append(attr_name)
+        return modifiers
+
+    def _get_class_statements(self, node) -> Dict[str, any]:
+        import ast
+
+        statements = {}
+        for statement in node.body:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                statements[statement.name] = statement
+            elif isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+                    and isinstance(statement.targets[0], ast.Name):
+                statements[statement.targets[0].id] = statement
+        return statements
+
+    def _get_info_arguments(self, clsname: str, var_name: str, info: Info, statements) -> Dict[str, any]:
+        import ast
+        import inspect
+
+        statement = statements.get(var_name)
+        call = getattr(statement, "value", None)
+        if not isinstance(call, ast.Call) \
+                or any(isinstance(arg, ast.Starred) for arg in call.args) \
+                or any(keyword.arg is None for keyword in call.keywords):
+            self._raise_unsupported(clsname, f"doesn't declare \"{var_name}\" by a direct Info call")
+
+        # Info argument name -> its expression node
+        signature = inspect.signature(type(info).__init__)
+        return signature.bind(None,
+                              *call.args,
+                              **{keyword.arg: keyword.value for keyword in call.keywords}).arguments
+
+    def _gen_type_check(self, clsname: str, var_name: str, info: Info, arguments, pre_class_lines: List[str]) -> List[str]:
+        var_type = info._type
+        if var_type in (any, object, Any) or isinstance(var_type, TypeVar):
+            return []
+
+        if isinstance(var_type, str):
+            # Recursive type, resolved from the module when validated
+            if not all(name.isidentifier() for name in var_type.split(".")):
+                self._raise_unsupported(clsname, f"has an unknown type for \"{var_name}\": {var_type}")
+            type_name = types_name = var_type
+        else:
+            type_name = f"_kisa_{clsname}_{var_name}_type"
+            pre_class_lines.append(f"{type_name} = {self._get_expression_source(arguments['type'])}")
+            if self._is_plain_type(var_type):
+                types_name = type_name
+            elif getattr(var_type, "__origin__", None) is Union \
+                    and all(self._is_plain_type(arg) for arg in var_type.__args__):
+                types_name = f"{type_name}s"
+                pre_class_lines.append(f"{types_name} = {type_name}.__args__")
+            else:
+                self._raise_unsupported(clsname, f"has an unsupported type for \"{var_name}\": {var_type}")
+
+        condition = f"not isinstance(val, {types_name})"
+        if info.allow_none:
+            condition += " and val is not None"
+        return [f"if {condition}:",
+                f"{self._static_indent}raise Exception(f'\"{var_name}\" must be of type: {{{type_name}}}')"]
+
+    @staticmethod
+    def _is_plain_type(var_type) -> bool:
+        return isinstance(var_type, type) and not hasattr(var_type, "__origin__")
+
+    def _gen_default(self, clsname: str, var_name: str, arguments, body: List[str]) -> str:
+        import ast
+
+        default_node = arguments.get("default")
+        if default_node is None:
+            return "None"
+        if isinstance(default_node, ast.Constant):
+            return self._get_expression_source(default_node)
+
+        # NOTE: staticmethod, so default functions aren't bound to the instance
+        body.append(f"__kisa_default_{var_name} = staticmethod({self._get_expression_source(default_node)})")
+        # NOTE: Mangled explicitly, since it's also used out of the class
+        return f"{clsname}.{self._mangle(clsname, f'__kisa_default_{var_name}')}"
+
+    @staticmethod
+    def _gen_default_value(info: Info, default: str, self_name: str) -> str:
+        if not callable(info.default):
+            return default
+        elif _KisaInternal._is_default_require_self(info.default):
+            return f"{default}({self_name})"
+        else:
+            return f"{default}()"
+
+    def _gen_instance_accessor(self,
+                               clsname: str,
+                               var_name: str,
+                               accessor_name: str,
+                               info: Info,
+                               type_check: List[str],
+                               default: str,
+                               var_modifiers,
+                               lazy_setter: str) -> List[str]:
+        storage_name = f"_kisa_{var_name}"
+        final_check = [f"if \"{storage_name}\" in self.__dict__:",
+                       f"{self._static_indent}raise Exception('Tried to modify a final attribute \"{var_name}\"')"]
+
+        core_name = accessor_name if var_modifiers is None else self._get_core_name(accessor_name)
+        lines = [f"def {core_name}(self, *args):",
+                 "    if not args:",
+                 "        try:",
+                 f"            return self.{storage_name}",
+                 "        except AttributeError:",
+                 f"            self.{lazy_setter}({self._gen_default_value(info, default, 'self')})",
+                 f"            return self.{storage_name}",
+                 "    val = args[0]"]
+        if info.final and var_modifiers is None:
+            lines.extend(self._indent(final_check))
+        lines.extend(self._indent(type_check))
+        lines.append(f"    self.__dict__[\"{storage_name}\"] = val")
+        lines.append("    return val")
+
+        if var_modifiers is not None:
+            # NOTE: As in Kisa, final is checked after the before modifiers
+            final_check[0] = f"if args and \"{storage_name}\" in self.__dict__:"
+            lines.extend(self._gen_modifiers_wrapper(clsname,
+                                                     accessor_name,
+                                                     var_name,
+                                                     False,
+                                                     var_modifiers,
+                                                     f"self.{core_name}(*args, **kwargs)",
+                                                     final_check if info.final else []))
+        return lines
+
+    def _gen_static_accessor(self,
+                             clsname: str,
+                             var_name: str,
+                             info: Info,
+                             type_check: List[str],
+                             default: str,
+                             var_modifiers) -> List[str]:
+        storage_name = f"__kisa_value_{var_name}"
+        final_check = [f"if \"{self._mangle(clsname, storage_name)}\" in {clsname}.__dict__:",
+                       f"{self._static_indent}raise Exception('Tried to modify a final attribute \"{var_name}\"')"]
+
+        core_name = var_name if var_modifiers is None else self._get_core_name(var_name)
+        lines = ["@staticmethod",
+                 f"def {core_name}(*args):",
+                 "    if not args:",
+                 "        try:",
+                 f"            return {clsname}.{storage_name}",
+                 "        except AttributeError:",
+                 f"            {clsname}.{var_name}({self._gen_default_value(info, default, clsname)})",
+                 f"            return {clsname}.{storage_name}",
+                 "    val = args[0]"]
+        if info.final and var_modifiers is None:
+            lines.extend(self._indent(final_check))
+        lines.extend(self._indent(type_check))
+        lines.append(f"    {clsname}.{storage_name} = val")
+        lines.append("    return val")
+
+        if var_modifiers is not None:
+            final_check[0] = final_check[0].replace("if ", "if args and ", 1)
+            lines.extend(self._gen_modifiers_wrapper(clsname,
+                                                     var_name,
+                                                     var_name,
+                                                     True,
+                                                     var_modifiers,
+                                                     f"{clsname}.{core_name}(*args, **kwargs)",
+                                                     final_check if info.final else []))
+        return lines
+
+    def _gen_modifiers_wrapper(self,
+                               clsname: str,
+                               func_name: str,
+                               attribute_name: str,
+                               is_static: bool,
+                               attribute_modifiers,
+                               core_call: str,
+                               final_check: List[str] = ()) -> List[str]:
+        if attribute_modifiers is None:
+            attribute_modifiers = {modifier_type: [] for modifier_type in _KisaCompiler._static_modifier_types}
+        self_arg = "" if is_static else "self, "
+
+        lines = [""]
+        if is_static:
+            lines.append("@staticmethod")
+        lines.append(f"def {func_name}({self_arg}*args, **kwargs):")
+        for modifier_name in attribute_modifiers["before"]:
+            lines.append(
+                f"    {clsname}.__kisa_modifier_{modifier_name}({self_arg}\"{attribute_name}\", *args, **kwargs)")
+        lines.extend(self._indent(final_check))
+
+        around_modifiers = attribute_modifiers["around"]
+        if len(around_modifiers) == 0:
+            lines.append(f"    retval = {core_call}")
+        else:
+            # NOTE: As in Kisa, the last declared around is the outermost
+            lines.append("    def next_0(*args, **kwargs):")
+            lines.append(f"        return {core_call}")
+            for index, modifier_name in enumerate(around_modifiers):
+                lines.append(f"    def next_{index + 1}(*args, **kwargs):")
+                lines.append(
+                    f"        return {clsname}.__kisa_modifier_{modifier_name}({self_arg}\"{attribute_name}\", next_{index}, *args, **kwargs)")
+            lines.append(f"    retval = next_{len(around_modifiers)}(*args, **kwargs)")
+
+        for modifier_name in attribute_modifiers["after"]:
+            lines.append(
+                f"    {clsname}.__kisa_modifier_{modifier_name}({self_arg}\"{attribute_name}\", *args, **kwargs)")
+        lines.append("    return retval")
+        return lines
+
+    def _gen_constructor(self, internal: _KisaInternal, base_name: str, constructor_setters, defaults, modifiers) -> List[str]:
+        clsname = internal._private_class_data.class_name
+
+        def gen_set(var_name, value):
+            setter, trusted_setter = constructor_setters[var_name]
+            if setter == trusted_setter:
+                return [f"self.{setter}({value})"]
+            return ["if trusted:",
+                    f"    self.{trusted_setter}({value})",
+                    "else:",
+                    f"    self.{setter}({value})"]
+
+        lines = ["def _kisa_construct(self, kwargs, trusted):"]
+        if base_name != "object":
+            lines.append(f"    {base_name}._kisa_construct(self, kwargs, trusted)")
+
+        default_vars = []
+        for var_name, info in internal._vars_info.items():
+            if info.static:
+                continue
+            lines.append(f"    if \"{var_name}\" in kwargs:")
+            lines.extend(self._indent(gen_set(var_name, f"kwargs[\"{var_name}\"]"), 2))
+            if info.required:
+                lines.append("    else:")
+                lines.append(
+                    f"        raise Exception('\"{var_name}\" is Missing in instance creation for class {clsname}')")
+            elif not info.lazy:
+                default_vars.append(var_name)
+
+        for var_name in default_vars:
+            info = internal._vars_info[var_name]
+            # NOTE: May already be initialized through the lazy mechanism
+            lines.append(f"    if \"_kisa_{var_name}\" not in self.__dict__:")
+            lines.extend(self._indent(gen_set(var_name, self._gen_default_value(info, defaults[var_name], "self")), 2))
+
+        if len(lines) == 1:
+            lines.append("    pass")
+
+        init_modifiers = modifiers.get("__init__")
+        self._validate_modifiers(clsname, "__init__", internal._special_attributes_info["__init__"], init_modifiers)
+        is_abstract = internal._private_class_data.kisa_class_type is AbstractClass
+        inits_names = [("__init__", False)]
+        if internal._validation_mode != "off":
+            inits_names.append(("__kisa_trusted_init", True))
+
+        for init_name, trusted in inits_names:
+            core_name = init_name if init_modifiers is None else self._get_core_name(init_name)
+            lines.append("")
+            lines.append(f"def {core_name}(self, **kwargs):")
+            if is_abstract:
+                lines.append(
+                    f"    raise Exception(f\"Can't initialize abstract Class \\\"{{self.__class__}}\\\"\")")
+            else:
+                lines.append(f"    if not kwargs.keys() <= {clsname}.__kisa_attributes:")
+                lines.append("        # Unknown attributes, raises as in Kisa")
+                lines.append(
+                    f"        object.__init__(self, **{{name: value for name, value in kwargs.items() if name not in {clsname}.__kisa_attributes}})")
+                lines.append(f"    {clsname}._kisa_construct(self, kwargs, {trusted})")
+            if init_modifiers is not None:
+                lines.extend(self._gen_modifiers_wrapper(clsname,
+                                                         init_name,
+                                                         "__init__",
+                                                         False,
+                                                         init_modifiers,
+                                                         f"self.{core_name}(*args, **kwargs)"))
+
+        lines.append("")
+        lines.append("@classmethod")
+        lines.append("def from_trusted(cls, **kwargs):")
+        if len(inits_names) == 1:
+            lines.append("    return cls(**kwargs)")
+        else:
+            lines.append("    instance = cls.__new__(cls)")
+            lines.append("    instance.__kisa_trusted_init(**kwargs)")
+            lines.append("    return instance")
+
+        if base_name == "object":
+            lines.append("")
+            lines.append("def __setattr__(self, key, val):")
+            lines.append("    raise Exception(f\"Can't modify instance values: Tried to modify \\\"{key}\\\"\")")
+        return lines
+
+    def _get_docstring(self, node) -> List[str]:
+        import ast
+
+        first_statement = node.body[0]
+        if isinstance(first_statement, ast.Expr) and isinstance(first_statement.value, ast.Constant) \
+                and isinstance(first_statement.value.value, str):
+            return self._get_statement_source(first_statement)
+        return None
+
+    def _get_function_source(self, clsname: str, func_name: str, statements, strip_decorator=False) -> List[str]:
+        import ast
+
+        statement = statements.get(func_name)
+        if statement is None or \
+                (strip_decorator and not (isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef))
+                                          and statement.decorator_list)):
+            self._raise_unsupported(clsname, f"doesn't declare \"{func_name}\" by a function definition")
+        return self._get_statement_source(statement, strip_decorator)
+
+    def _get_statement_source(self, statement, strip_decorator=False) -> List[str]:
+        decorators = getattr(statement, "decorator_list", [])
+        if strip_decorator:
+            # NOTE: The outermost decorator is the Kisa one (e.g. kisa.static)
+            decorators = decorators[1:]
+
+        start_lineno = min([statement.lineno] + [decorator.lineno for decorator in decorators])
+        indent = statement.col_offset
+        lines = []
+        for line in self._source_lines[start_lineno - 1:statement.end_lineno]:
+            if line[:indent].isspace():
+                line = line[indent:]
+            lines.append(line)
+        return lines
+
+    def _get_expression_source(self, node) -> str:
+        import ast
+
+        source = ast.get_source_segment(self._source, node)
+        if "\n" in source:
+            source = f"({source})"
+        return source
+
+    def _remove_unused_kisa_import(self, lines: List[str]) -> List[str]:
+        import ast
+
+        tree = ast.parse("\n".join(lines))
+        if any(isinstance(node, ast.Name) and node.id == "kisa" for node in ast.walk(tree)):
+            return lines
+
+        for node in reversed(tree.body):
+            if isinstance(node, ast.Import) and \
+                    [(alias.name, alias.asname) for alias in node.names] == [("kisa", None)]:
+                del lines[node.lineno - 1:node.end_lineno]
+        return lines
+
+    def _indent(self, lines: List[str], depth=1) -> List[str]:
+        return [self._static_indent * depth + line if line else line for line in lines]
+
+    @staticmethod
+    def _get_core_name(accessor_name: str) -> str:
+        if accessor_name.startswith("__kisa_"):
+            return f"{accessor_name}_core"
+        return f"__kisa_{accessor_name.strip('_')}_core"
+
+    @staticmethod
+    def _mangle(clsname: str, name: str) -> str:
+        return f"_{clsname.lstrip('_')}{name}"
+
+    @staticmethod
+    def _raise_unsupported(clsname: str, reason: str):
+        raise Exception(f"Class \"{clsname}\" can't be compiled, it {reason}")
+
 
 def before(*attribute_name):
-    return lambda callback: _BeforeClass(gen_callback=lambda *args: callback, name=attribute_name)
+    return lambda callback: _BeforeClass(gen_callback=lambda *args: callback,
+                                         name=attribute_name,
+                                         callback=callback)
 
 
 def around(*attribute_name):
-    return lambda callback: _AroundClass(gen_callback=lambda *args: callback, name=attribute_name)
+    return lambda callback: _AroundClass(gen_callback=lambda *args: callback,
+                                         name=attribute_name,
+                                         callback=callback)
+
+
+def after(*attribute_name, deferred: bool = False):
+    def inner(callback):
+        if not deferred:
+            return _AfterClass(gen_callback=lambda *args: callback,
+                               name=attribute_name,
+                               callback=callback)
+
+        deferred_callback = _KisaInternal._gen_deferred_callback(callback)
+        return _AfterClass(gen_callback=lambda *args: deferred_callback,
+                           name=attribute_name)
+
+    return inner
+
+
+def configure_deferred(max_pending: int = 1024,
+                       batch_size: int = 64,
+                       overflow: str = "block",
+                       on_error: Callable[[Exception], None] = None,
+                       exit_timeout: float = 5.0):
+    if on_error is None:
+        on_error = _report_deferred_error
+    if exit_timeout is not None and exit_timeout < 0:
+        raise Exception(f"Deferred exit_timeout must be positive, got {exit_timeout}")
+    executor = _DeferredExecutor(max_pending=max_pending,
+                                 batch_size=batch_size,
+                                 overflow=overflow,
+                                 on_error=on_error,
+                                 exit_timeout=exit_timeout)
+
+    with _KisaInternal._static_deferred_executor_lock:
+        previous_executor = _KisaInternal._static_deferred_executor
+        _KisaInternal._static_deferred_executor = executor
+    if previous_executor is not None:
+        # NOTE: Modifiers already submitted still run by the previous configuration
+        previous_executor.shutdown()
+
+
+def flush_deferred(timeout: float = None) -> bool:
+    executor = _KisaInternal._static_deferred_executor
+    if executor is None:
+        return True
+    return executor.flush(timeout)
+
+
+def deferred_stats() -> Dict[str, int]:
+    return _KisaInternal._get_deferred_executor().stats()
+
+
+def release(instance):
+    instance_class = instance.__class__
+    if not _KisaInternal._is_class_kisa(instance_class):
+        raise Exception(f"Can't release non Kisa instance: {instance}")
+
+    pool = _KisaInternal._get_class_private_data(instance_class).pool
+    if pool is None:
+        raise Exception(f"Class \"{instance_class.__name__}\" has no instance pool")
+    pool.release(instance)
+
+
+def pool_stats(kisa_class) -> Dict[str, int]:
+    if not _KisaInternal._is_class_kisa(kisa_class):
+        raise Exception(f"Not a Kisa class: {kisa_class}")
+
+    pool = _KisaInternal._get_class_private_data(kisa_class).pool
+    if pool is None:
+        raise Exception(f"Class \"{kisa_class.__name__}\" has no instance pool")
+    return pool.stats()
+
+
+def evolve(instance, **changes):
+    instance_class = instance.__class__
+    if not _KisaInternal._is_class_kisa(instance_class):
+        raise Exception(f"Can't evolve non Kisa instance: {instance}")
+
+    return _KisaInternal._get_class_private_data(instance_class).evolve(instance, changes)
+
 
+def changed_fields(instance) -> AbstractSet[str]:
+    changed = _KisaInternal._get_instance_private_data(instance).changed_fields
+    if changed is None:
+        raise Exception(
+            f"Class \"{instance.__class__.__name__}\" does not track changes")
+    return frozenset(changed)
+
+
+def clear_changes(instance):
+    _KisaInternal._get_instance_private_data(instance).clear_changes()
+
+
+def observe_changes(kisa_class, callback: Callable[[any, AbstractSet[str]], None]):
+    if not _KisaInternal._is_class_kisa(kisa_class):
+        raise Exception(f"Not a Kisa class: {kisa_class}")
+
+    class_data = _KisaInternal._get_class_private_data(kisa_class)
+    if not class_data.track_changes:
+        raise Exception(f"Class \"{kisa_class.__name__}\" does not track changes")
+    class_data.change_observers.append(callback)
+
+
+def flush_changes(instance) -> AbstractSet[str]:
+    changed = changed_fields(instance)
+    if len(changed) == 0:
+        return changed
+
+    # NOTE: Cleared before notifying, so changes made by observers are kept for the next flush
+    clear_changes(instance)
+    for class_data in _KisaInternal._get_inheritance_classes_data(instance.__class__):
+        for observer in class_data.change_observers:
+            observer(instance, changed)
+    return changed
+
+
+def update(kisa_class, attribute_name: str, callback: Callable[[any], any]):
+    lock, get_value, set_value = _KisaInternal._get_static_attribute_access(kisa_class, attribute_name)
+    with lock:
+        return set_value(callback(get_value()))
+
+
+def increment(kisa_class, attribute_name: str, amount=1):
+    return update(kisa_class, attribute_name, lambda value: value + amount)
+
+
+def compare_and_set(kisa_class, attribute_name: str, expected, value) -> bool:
+    lock, get_value, set_value = _KisaInternal._get_static_attribute_access(kisa_class, attribute_name)
+    with lock:
+        if get_value() != expected:
+            return False
+        set_value(value)
+        return True
+
+
+def sort_key(kisa_class, *attribute_names: str) -> Callable[[any], any]:
+    return _KisaInternal._gen_sort_key(kisa_class, list(attribute_names))
+
+
+def prefetch(instances, attribute_name: str, executor=None) -> int:
+    tasks = _KisaInternal._get_prefetch_tasks(instances, attribute_name)
+    if len(tasks) == 0:
+        return 0
+
+    owns_executor = executor is None
+    if owns_executor:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=min(32, len(tasks)))
+
+    error = None
+    try:
+        futures = [executor.submit(internal._get_default_value, attribute_name, instance)
+                   for internal, instance in tasks]
+        # NOTE: The values are stored by the calling thread, as the first read would
+        for (internal, instance), future in zip(tasks, futures):
+            try:
+                value = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            _KisaInternal._store_prefetched_value(internal, instance, attribute_name, value)
+    finally:
+        if owns_executor:
+            executor.shutdown()
 
-def after(*attribute_name):
-    return lambda callback: _AfterClass(gen_callback=lambda *args: callback, name=attribute_name)
+    if error is not None:
+        raise error
+    return len(tasks)
+
+
+async def prefetch_async(instances, attribute_name: str, max_concurrency: int = None, executor=None) -> int:
+    import asyncio
+    # NOTE: Imported by asyncio anyway
+    import inspect
+
+    tasks = _KisaInternal._get_prefetch_tasks(instances, attribute_name)
+    if len(tasks) == 0:
+        return 0
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+
+    async def compute(internal, instance):
+        if inspect.iscoroutinefunction(internal._vars_info[attribute_name].default):
+            value = internal._get_default_value(attribute_name, instance)
+        else:
+            # Blocking defaults run on the executor (the loop default executor, if not given)
+            value = await loop.run_in_executor(executor, internal._get_default_value, attribute_name, instance)
+        if inspect.isawaitable(value):
+            value = await value
+        _KisaInternal._store_prefetched_value(internal, instance, attribute_name, value)
+
+    async def limited_compute(internal, instance):
+        async with semaphore:
+            await compute(internal, instance)
+
+    results = await asyncio.gather(*[(compute if semaphore is None else limited_compute)(internal, instance)
+                                     for internal, instance in tasks],
+                                   return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return len(tasks)
+
+
+def configure_lazy_cache(max_entries: int = 1024, max_bytes: int = None, sizeof: Callable[[any], int] = None):
+    if max_entries is not None and max_entries <= 0:
+        raise Exception(f"Lazy cache max entries must be positive, got {max_entries}")
+    if max_bytes is not None and max_bytes <= 0:
+        raise Exception(f"Lazy cache max bytes must be positive, got {max_bytes}")
+    if sizeof is None:
+        sizeof = sys.getsizeof
+    _KisaInternal._static_lazy_cache.configure(max_entries, max_bytes, sizeof)
+
+
+def lazy_cache_stats() -> Dict[str, int]:
+    return _KisaInternal._static_lazy_cache.stats()
+
+
+def configure_tracing(exporter):
+    # NOTE: None disables tracing
+    _KisaInternal._static_tracer.exporter = exporter
+
+
+def pack_shared(instances) -> _SharedBatch:
+    import pickle
+    from multiprocessing import shared_memory
+
+    instances = list(instances)
+    payload = pickle.dumps(_KisaInternal._pack_instances(instances),
+                           protocol=pickle.HIGHEST_PROTOCOL)
+    block = shared_memory.SharedMemory(create=True, size=max(len(payload), 1))
+    try:
+        block.buf[:len(payload)] = payload
+    except BaseException:
+        block.unlink()
+        raise
+    finally:
+        block.close()
+    # NOTE: The block is kept until free_shared is called
+    return _SharedBatch(block.name, len(payload), len(instances))
+
+
+def unpack_shared(batch: _SharedBatch) -> list:
+    import pickle
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(name=batch.name)
+    try:
+        packed = pickle.loads(block.buf[:batch.size])
+    finally:
+        block.close()
+    return _KisaInternal._unpack_instances(packed)
+
+
+def free_shared(batch: _SharedBatch):
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(name=batch.name)
+    block.close()
+    block.unlink()
+
+
+def track_instances(enabled: bool = True):
+    _KisaInternal._static_track_instances = enabled
+    for class_data in list(_KisaInternal._static_classes_data.values()):
+        if not enabled:
+            class_data.live_instances = None
+        elif class_data.live_instances is None:
+            # NOTE: Only instances created from now on are tracked
+            class_data.live_instances = _LiveInstances()
+
+
+def memory_report() -> List[Dict[str, any]]:
+    reports = [_KisaInternal._get_class_memory_report(kisa_class)
+               for kisa_class in list(_KisaInternal._static_classes_data.keys())]
+
+    # Classes retaining the most memory first
+    def retained_bytes(report):
+        instances_bytes = 0
+        if report["instances"] is not None:
+            instances_bytes = report["instances"] * report["bytes_per_instance"]
+        return instances_bytes + report["lazy_values_bytes"] + report["pinned_frames_bytes"]
+
+    return sorted(reports, key=retained_bytes, reverse=True)
+
+
+def set_validation_mode(validation: str):
+    _KisaInternal._validate_validation_mode(validation)
+    _KisaInternal._static_validation_mode = validation
+
+
+def memoize(callback: Callable = None, maxsize: int = 128):
+    if callback is None:
+        return lambda callback: _MemoizedMethod(callback, maxsize)
+    return _MemoizedMethod(callback, maxsize)
+
+
+def memoize_stats(kisa_class, method_name: str) -> Dict[str, any]:
+    if not _KisaInternal._is_class_kisa(kisa_class):
+        raise Exception(f"Not a Kisa class: {kisa_class}")
+
+    for class_data in _KisaInternal._get_inheritance_classes_data(kisa_class):
+        if method_name in class_data.memoized_methods:
+            return class_data.memoized_methods[method_name].stats()
+    raise Exception(
+        f"Method \"{method_name}\" of class \"{kisa_class.__name__}\" is not memoized")
 
 
 def abstract(_callback):
@@ -930,6 +4008,77 @@ def abstract(_callback):
 def static(callback: Callable):
     return _StaticClass(callback)
 
+
+def make_class(name: str,
+               fields: Dict[str, Union[Info, Dict[str, any], any]] = None,
+               extends=object,
+               implements=[],
+               modifiers: Union[Dict[str, _AttributeModifier], List[_AttributeModifier]] = None,
+               methods: Dict[str, Callable] = None,
+               module: Union[str, types.ModuleType, Dict[str, any]] = None,
+               metaclass=Class,
+               **options):
+    # Creates a Kisa class without a class statement, e.g. from a schema.
+    # String types are resolved from the given module/namespace rather than from the caller frames
+    if not isinstance(name, str) or not name.isidentifier():
+        raise Exception(f"Invalid class name: {name}")
+
+    if module is None:
+        namespace, module_name = {}, None
+    elif isinstance(module, str):
+        import importlib
+        module_name = module
+        namespace = vars(importlib.import_module(module))
+    elif isinstance(module, types.ModuleType):
+        namespace, module_name = vars(module), module.__name__
+    elif isinstance(module, dict):
+        namespace, module_name = module, module.get("__name__")
+    else:
+        raise Exception(f"module must be a module, a module name or a namespace dict, got: {module}")
+
+    # NOTE: The created class is resolved by its name as well (e.g. List["Node"]), without
+    #       adding it to the given namespace
+    class_names: Dict[str, any] = {}
+    namespace = collections.ChainMap(class_names, namespace)
+
+    if modifiers is not None and not isinstance(modifiers, dict):
+        modifiers = {f"_modifier_{i}": modifier for i, modifier in enumerate(modifiers)}
+
+    class_desc = _KisaDict(name)
+    if module_name is not None:
+        class_desc["__module__"] = module_name
+    class_desc["__qualname__"] = name
+    for attributes in (fields, methods, modifiers):
+        if attributes is None:
+            continue
+        for attr_name, attr_value in attributes.items():
+            if not isinstance(attr_name, str) or not attr_name.isidentifier():
+                raise Exception(f"Invalid attribute name \"{attr_name}\" for class \"{name}\"")
+            if attr_name in class_desc:
+                raise Exception(f"Attribute \"{attr_name}\" is declared twice for class \"{name}\"")
+
+            if attributes is fields:
+                if isinstance(attr_value, dict):
+                    # Info arguments, the Info is created here without inspecting the frames
+                    attr_value = Info(**attr_value, _capture_frame=False)
+                elif not isinstance(attr_value, Info):
+                    # A plain type, declared as a required attribute
+                    attr_value = Info(type=attr_value, _capture_frame=False)
+                attr_value._set_namespace(namespace, module_name)
+            elif attributes is modifiers and not isinstance(attr_value, _AttributeModifier):
+                raise Exception(f"Modifier \"{attr_name}\" must be created by kisa.before/around/after, got: {attr_value}")
+            class_desc[attr_name] = attr_value
+
+    class_options = dict(options)
+    if extends is not object:
+        class_options["extends"] = extends
+    if implements:
+        class_options["implements"] = implements
+    # NOTE: Calls the metaclass directly, the same as a class statement but with no __prepare__
+    created_class = metaclass.__new__(metaclass, name, (), class_desc, **class_options)
+    class_names[name] = created_class
+    return created_class
+
 # TODO: add validation of getter return type
 
 
@@ -987,3 +4136,35 @@ def setter(attribute_name):
         return _AroundClass(gen_callback=generate_setter, name=attribute_name)
 
     return inner
+
+
+def compile_module(module) -> str:
+    if isinstance(module, str):
+        import importlib
+        module = importlib.import_module(module)
+    return _KisaCompiler(module).compile()
+
+
+def _main(argv: List[str]):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m kisa")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_parser = commands.add_parser("compile",
+                                         help="Emit a module with its Kisa classes compiled to plain classes")
+    compile_parser.add_argument("module", help="Name of the module to compile")
+    compile_parser.add_argument("-o", "--output", help="Output file (default: standard output)")
+    args = parser.parse_args(argv)
+
+    source = compile_module(args.module)
+    if args.output is None:
+        sys.stdout.write(source)
+    else:
+        with open(args.output, "w") as output_file:
+            output_file.write(source)
+
+
+if __name__ == "__main__":
+    # NOTE: Kisa classes are registered in the imported kisa module, rather than in __main__
+    import kisa
+    kisa._main(sys.argv[1:])
@@ -0,0 +1,126 @@
+
+# Kisa classes compiled by the compiler tests. run_scenario() is run against both
+# these classes and the compiled ones, and is expected to return the same events.
+
+import re
+from typing import Optional
+import kisa
+
+
+class Shape(metaclass=kisa.AbstractClass):
+    name = kisa.Info(type=str)
+    created = kisa.StaticInfo(type=int, default=0)
+    events = kisa.StaticInfo(type=list, default=lambda: [])
+
+    @kisa.abstract
+    def area(self):
+        pass
+
+    def describe(self):
+        return f"{self.name()}: {self.area()}"
+
+
+class Drawable(metaclass=kisa.Interface):
+    @kisa.abstract
+    def draw(self):
+        pass
+
+
+class Rectangle(metaclass=kisa.Class, extends=Shape, implements=Drawable):
+    width = kisa.Info(type=int)
+    height = kisa.Info(type=int, final=True)
+    color = kisa.Info(type=Optional[str], default="red")
+    tags = kisa.Info(type=list, default=lambda: [])
+    area_cache = kisa.Info(type=int, lazy=True, default=lambda self: self.area())
+    parent = kisa.Info(type="Rectangle", required=False)
+    unit = kisa.StaticInfo(type=str, final=True, default="cm")
+    scale = kisa.StaticInfo(type=float, lazy=True, default=lambda: 1.0)
+
+    def area(self):
+        return self.width() * self.height()
+
+    def draw(self):
+        return "#" * self.width()
+
+    @kisa.static
+    def square(size):
+        return Rectangle(name="square", width=size, height=size)
+
+    @kisa.before("width", "draw")
+    def log_call(self, attr_name, *args):
+        Shape.events().append(("before", attr_name, args))
+
+    @kisa.around("draw")
+    def frame(self, attr_name, next, *args):
+        return "[" + next(*args) + "]"
+
+    @kisa.around("draw")
+    def shout(self, attr_name, next, *args):
+        return next(*args).upper() + "!"
+
+    @kisa.after("__init__")
+    def count_created(self, attr_name, **kwargs):
+        Shape.created(Shape.created() + 1)
+
+    @kisa.after("name")
+    def log_name(self, attr_name, *args):
+        Shape.events().append(("after", attr_name, args))
+
+    @kisa.around("scale")
+    def double_scale(attr_name, next, *args):
+        if args:
+            return next(args[0] * 2)
+        return next()
+
+
+class Point(metaclass=kisa.Class, validation="construct"):
+    x = kisa.Info(type=int)
+    y = kisa.Info(type=int, default=0)
+
+
+def run_scenario():
+    events = []
+
+    def record(callback):
+        try:
+            events.append(callback())
+        except Exception as e:
+            # NOTE: The module of the classes differs between Kisa and compiled classes
+            events.append((type(e).__name__, re.sub(r"'[\w.]*\.(\w+)'", r"\1", str(e))))
+
+    record(lambda: Shape(name="shape"))
+    record(lambda: Drawable())
+    record(lambda: Rectangle(name="r", height=2))
+    record(lambda: Rectangle(name="r", width="1", height=2))
+    record(lambda: Rectangle(name="r", width=1, height=2, unknown=3))
+
+    rect = Rectangle(name="rect", width=3, height=2, color=None)
+    record(lambda: rect.describe())
+    record(lambda: rect.draw())
+    record(lambda: rect.area_cache())
+    record(lambda: rect.width(4))
+    record(lambda: rect.area_cache())
+    record(lambda: rect.height(5))
+    record(lambda: rect.color())
+    record(lambda: rect.color(1))
+    record(lambda: rect.tags() is Rectangle(name="other", width=1, height=1).tags())
+    record(lambda: rect.parent(rect).name())
+    record(lambda: rect.parent("rect"))
+    record(lambda: setattr(rect, "width", 1))
+
+    record(lambda: Rectangle.square(2).describe())
+    record(lambda: Rectangle.from_trusted(name="trusted", width="1", height=2).width())
+    record(lambda: Rectangle.unit())
+    record(lambda: Rectangle.unit("m"))
+    record(lambda: Rectangle.scale())
+    record(lambda: Rectangle.scale(2.0))
+    record(lambda: Rectangle.scale("2"))
+    record(lambda: Shape.created())
+    record(lambda: Shape.events())
+
+    point = Point(x=1)
+    record(lambda: (point.x(), point.y()))
+    record(lambda: point.x("1"))
+    record(lambda: Point(x="1"))
+    record(lambda: Point.from_trusted(x="1").x())
+    return events
@@ -1,8 +1,31 @@
 
+import asyncio
+import copy
+import importlib
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from typing import ClassVar, Dict, List, Optional, Tuple, Union
 import kisa
 
 
+# NOTE: Declared in the module, so pickle can find it
+class PicklableNode(metaclass=kisa.Class):
+    value = kisa.Info(type=int)
+    tags = kisa.Info(type=list, default=lambda: [])
+    doubled = kisa.Info(type=int, lazy=True, default=lambda self: self.value() * 2)
+    parent = kisa.Info(type="PicklableNode", required=False)
+
+
+def sum_shared_nodes(batch):
+    return sum(node.doubled() for node in kisa.unpack_shared(batch))
+
+
 class KisaUnitTests(unittest.TestCase):
 
     def test_empty_class(self):
@@ -257,6 +280,606 @@ class KisaUnitTests(unittest.TestCase):
         p.name("Noam")
         self.assertEqual(p.name(), "Noam")
 
+    def test_static_final_modified(self):
+        calls = []
+
+        class Config(metaclass=kisa.Class):
+            mode = kisa.StaticInfo(type=str, final=True, default="fast")
+
+            @kisa.before("mode")
+            def log_mode(attr_name, *args):
+                calls.append(args)
+
+        self.assertEqual(Config.mode(), "fast")
+        with self.assertRaises(Exception):
+            Config.mode("slow")
+        self.assertEqual(calls, [("fast",), (), ("slow",)])
+
+    def test_getattribute_modifier(self):
+        accessed = []
+
+        class Person(metaclass=kisa.Class):
+            name = kisa.Info(type=str)
+
+            @kisa.before("__getattribute__")
+            def log_access(self, attr_name, key):
+                accessed.append(key)
+
+        self.assertEqual(Person(name="Noam").name(), "Noam")
+        self.assertIn("name", accessed)
+
+    def test_static_atomic_operations(self):
+        class Counter(metaclass=kisa.Class):
+            count = kisa.StaticInfo(type=int, default=0)
+            registry = kisa.StaticInfo(type=dict, lazy=True, default=lambda: {})
+            name = kisa.Info(type=str, required=False)
+
+        class SubCounter(metaclass=kisa.Class, extends=Counter):
+            pass
+
+        def increment_many():
+            for _ in range(1000):
+                kisa.increment(Counter, "count")
+
+        threads = [threading.Thread(target=increment_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(Counter.count(), 8000)
+
+        self.assertEqual(kisa.increment(SubCounter, "count", 2), 8002)
+        self.assertFalse(kisa.compare_and_set(Counter, "count", 0, 1))
+        self.assertTrue(kisa.compare_and_set(Counter, "count", 8002, 1))
+        self.assertEqual(Counter.count(), 1)
+
+        self.assertEqual(kisa.update(Counter, "registry", lambda registry: {**registry, "a": 1}), {"a": 1})
+        with self.assertRaises(Exception):
+            kisa.update(Counter, "count", str)
+        with self.assertRaises(Exception):
+            kisa.increment(Counter, "name")
+
+    def test_memory_report(self):
+        kisa.track_instances()
+        try:
+            class Document(metaclass=kisa.Class):
+                title = kisa.Info(type=str)
+                words = kisa.Info(type=list, lazy=True, default=lambda self: self.title().split())
+
+            class Untracked(metaclass=kisa.Class):
+                pass
+
+            documents = [Document(title=f"document number {i}") for i in range(5)]
+            for document in documents[:3]:
+                document.words()
+
+            reports = {report["class"]: report for report in kisa.memory_report()}
+            report = reports[Document]
+            self.assertEqual(report["instances"], 5)
+            self.assertGreater(report["bytes_per_instance"], 0)
+            self.assertGreater(report["lazy_values_bytes"], 0)
+            self.assertGreater(report["pinned_frames"], 0)
+
+            del documents, document
+            reports = {report["class"]: report for report in kisa.memory_report()}
+            self.assertEqual(reports[Document]["instances"], 0)
+            self.assertEqual(reports[Document]["lazy_values_bytes"], 0)
+        finally:
+            kisa.track_instances(False)
+
+        reports = {report["class"]: report for report in kisa.memory_report()}
+        self.assertIsNone(reports[Untracked]["instances"])
+
+    def test_track_instances_construction(self):
+        kisa.track_instances()
+        try:
+            class Point(metaclass=kisa.Class, eq=True):
+                x = kisa.Info(type=int, allow_none=False)
+
+            class FrozenPoint(metaclass=kisa.Class, frozen=True):
+                x = kisa.Info(type=int)
+
+            class Document(metaclass=kisa.Class, eq=True):
+                title = kisa.Info(type=str)
+                words = kisa.Info(type=list, lazy=True, default=lambda self: rendered.append(self) or [])
+
+            rendered = []
+            points = [Point(x=1), Point(x=1)]
+            self.assertEqual(points[0], points[1])
+            self.assertNotEqual(hash(FrozenPoint(x=1)), hash(FrozenPoint(x=2)))
+            document = Document(title="a")
+            # Lazy values aren't computed by the construction
+            self.assertEqual(rendered, [])
+
+            reports = {report["class"]: report for report in kisa.memory_report()}
+            self.assertEqual(reports[Point]["instances"], 2)
+            self.assertEqual(reports[Document]["instances"], 1)
+            del document
+            reports = {report["class"]: report for report in kisa.memory_report()}
+            self.assertEqual(reports[Document]["instances"], 0)
+        finally:
+            kisa.track_instances(False)
+
+    def test_pickle_and_copy(self):
+        node = PicklableNode(value=1, tags=["a"])
+        node.parent(node)
+
+        loaded = pickle.loads(pickle.dumps(node))
+        self.assertEqual(loaded.value(), 1)
+        self.assertEqual(loaded.tags(), ["a"])
+        self.assertIs(loaded.parent(), loaded)
+        self.assertEqual(loaded.doubled(), 2)
+        with self.assertRaises(Exception):
+            loaded.value("1")
+
+        shallow = copy.copy(node)
+        self.assertIs(shallow.tags(), node.tags())
+        self.assertIs(shallow.parent(), node)
+
+        deep = copy.deepcopy(node)
+        self.assertIsNot(deep.tags(), node.tags())
+        self.assertIs(deep.parent(), deep)
+
+        class Config(metaclass=kisa.Class, singleton=True):
+            name = kisa.Info(type=str, default="config")
+
+        config = Config()
+        self.assertIs(copy.copy(config), config)
+        self.assertIs(copy.deepcopy(config), config)
+
+    def test_shared_batch(self):
+        nodes = [PicklableNode(value=i) for i in range(100)]
+        nodes[0].doubled()
+
+        batch = kisa.pack_shared(nodes)
+        try:
+            self.assertEqual(len(batch), 100)
+            unpacked = kisa.unpack_shared(batch)
+            self.assertEqual([node.value() for node in unpacked], list(range(100)))
+            self.assertEqual(unpacked[99].doubled(), 198)
+
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                self.assertEqual(list(executor.map(sum_shared_nodes, [batch, batch])), [9900, 9900])
+        finally:
+            kisa.free_shared(batch)
+
+        with self.assertRaises(Exception):
+            kisa.pack_shared([object()])
+
+    def test_descriptors(self):
+        class Person(metaclass=kisa.Class, descriptors=True):
+            name = kisa.Info(type=str)
+            birth_year = kisa.Info(type=int, final=True)
+            nickname = kisa.Info(type=str, lazy=True, default=lambda self: self.name.lower())
+            visits = kisa.Info(type=int, default=0)
+
+            @kisa.around("visits")
+            def count_access(self, attr_name, next, *args):
+                accessed.append(args)
+                return next(*args)
+
+        accessed = []
+        person = Person(name="Noam", birth_year=1999)
+        self.assertEqual(person.name, "Noam")
+        self.assertEqual(person.nickname, "noam")
+        person.name = "Nisanov"
+        self.assertEqual(person.name, "Nisanov")
+        with self.assertRaises(Exception):
+            person.name = 1
+        with self.assertRaises(Exception):
+            person.birth_year = 2000
+        with self.assertRaises(Exception):
+            person.unknown = 1
+
+        person.visits = person.visits + 1
+        self.assertEqual(person.visits, 1)
+        self.assertIn((1,), accessed)
+        self.assertIn((), accessed)
+        self.assertEqual(kisa.evolve(person, name="Noam").name, "Noam")
+
+    def test_descriptors_delete(self):
+        class Point(metaclass=kisa.Class, descriptors=True):
+            x = kisa.Info(type=int)
+
+            def move(self):
+                pass
+
+        class FrozenPoint(metaclass=kisa.Class, descriptors=True, frozen=True):
+            x = kisa.Info(type=int, required=True)
+
+            def move(self):
+                pass
+
+        class Point3D(metaclass=kisa.Class, extends=Point):
+            z = kisa.Info(type=int, default=0)
+
+        for point in (Point(x=1), FrozenPoint(x=1), Point3D(x=1)):
+            for attr_name in ("x", "move"):
+                with self.assertRaisesRegex(Exception, f"Can't modify instance values: Tried to delete \"{attr_name}\""):
+                    delattr(point, attr_name)
+            with self.assertRaisesRegex(Exception, "Unknown attribute \"unknown\""):
+                del point.unknown
+            self.assertEqual(point.x, 1)
+
+    def test_descriptors_inheritance(self):
+        class Shape(metaclass=kisa.AbstractClass, descriptors=True):
+            width = kisa.Info(type=int)
+
+        class Square(metaclass=kisa.Class, extends=Shape):
+            area = kisa.ComputedInfo(type=int, default=lambda self: self.width * self.width)
+
+        square = Square(width=2)
+        self.assertEqual(square.area, 4)
+        square.width = 3
+        self.assertEqual(square.area, 9)
+
+        class Point(metaclass=kisa.Class):
+            x = kisa.Info(type=int)
+
+        with self.assertRaises(Exception):
+            class Point3D(metaclass=kisa.Class, extends=Point, descriptors=True):
+                z = kisa.Info(type=int)
+
+    def test_eq_and_order(self):
+        class Version(metaclass=kisa.Class, order=True):
+            major = kisa.Info(type=int)
+            minor = kisa.Info(type=int, default=0)
+            label = kisa.Info(type=str, lazy=True, default=lambda self: f"{self.major()}.{self.minor()}")
+
+        self.assertEqual(Version(major=1, minor=2), Version(major=1, minor=2))
+        self.assertNotEqual(Version(major=1, minor=2), Version(major=1, minor=3))
+        self.assertLess(Version(major=1, minor=2), Version(major=1, minor=10))
+        self.assertGreaterEqual(Version(major=2), Version(major=1, minor=10))
+        # NOTE: Mutable instances are unhashable, unless hash=True is given
+        with self.assertRaises(TypeError):
+            hash(Version(major=1))
+
+        class HashedVersion(metaclass=kisa.Class, eq=True, hash=True):
+            major = kisa.Info(type=int)
+
+        self.assertEqual(len({HashedVersion(major=1), HashedVersion(major=1), HashedVersion(major=2)}), 2)
+        with self.assertRaises(Exception):
+            class UncomparedVersion(metaclass=kisa.Class, hash=True):
+                major = kisa.Info(type=int)
+
+        version = Version(major=1)
+        version.minor(5)
+        self.assertEqual(version, Version(major=1, minor=5))
+
+        class SubVersion(metaclass=kisa.Class, extends=Version):
+            patch = kisa.Info(type=int, default=0)
+
+        self.assertNotEqual(SubVersion(major=1, patch=1), SubVersion(major=1, patch=2))
+        self.assertNotEqual(SubVersion(major=1), Version(major=1))
+        with self.assertRaises(TypeError):
+            Version(major=1) < SubVersion(major=1)
+
+    def test_sort_key(self):
+        class Item(metaclass=kisa.Class):
+            name = kisa.Info(type=str)
+            price = kisa.Info(type=int)
+            rank = kisa.Info(type=int, lazy=True, default=lambda self: -self.price())
+
+        items = [Item(name=name, price=price) for name, price in [("b", 2), ("a", 2), ("c", 1)]]
+        self.assertEqual([item.name() for item in sorted(items, key=kisa.sort_key(Item, "price", "name"))],
+                         ["c", "a", "b"])
+        self.assertEqual([item.name() for item in sorted(items, key=kisa.sort_key(Item, "rank"))],
+                         ["b", "a", "c"])
+        self.assertEqual(kisa.sort_key(Item)(items[0]), ("b", 2, -2))
+
+        class Point(metaclass=kisa.Class, descriptors=True):
+            x = kisa.Info(type=int)
+
+        self.assertEqual(kisa.sort_key(Point, "x")(Point(x=1)), 1)
+        with self.assertRaises(Exception):
+            kisa.sort_key(Item, "unknown")
+
+    def test_indexes(self):
+        class Person(metaclass=kisa.Class):
+            firstname = kisa.Info(type=str)
+            lastname = kisa.Info(type=str, index=True)
+            age = kisa.Info(type=int, index="sorted")
+
+        class Employee(metaclass=kisa.Class, extends=Person):
+            role = kisa.Info(type=str, index=True, default="developer")
+
+        people = [Person(firstname="Noam", lastname="Nisanov", age=22),
+                  Person(firstname="Dan", lastname="Cohen", age=30),
+                  Employee(firstname="Ron", lastname="Nisanov", age=40)]
+
+        self.assertEqual({p.firstname() for p in Person.find(lastname="Nisanov")}, {"Noam", "Ron"})
+        self.assertEqual([p.firstname() for p in Person.find(lastname="Nisanov", age=40)], ["Ron"])
+        self.assertEqual([p.firstname() for p in Employee.find(lastname="Nisanov")], ["Ron"])
+        self.assertEqual([p.firstname() for p in Employee.find(role="developer")], ["Ron"])
+        self.assertEqual([p.firstname() for p in Person.find_range("age", 25, 40)], ["Dan", "Ron"])
+        self.assertEqual([p.firstname() for p in Person.find_range("age", high=30)], ["Noam", "Dan"])
+
+        people[1].lastname("Nisanov")
+        self.assertEqual(len(Person.find(lastname="Nisanov")), 3)
+        self.assertEqual(Person.find(lastname="Cohen"), [])
+
+        evolved = kisa.evolve(people[0], firstname="Avi")
+        self.assertEqual(len(Person.find(lastname="Nisanov")), 4)
+        del evolved, people
+        self.assertEqual(Person.find(lastname="Nisanov"), [])
+        self.assertEqual(Person.find_range("age"), [])
+
+        with self.assertRaises(Exception):
+            Person.find(firstname="Noam")
+        with self.assertRaises(Exception):
+            Person.find_range("lastname", "A", "Z")
+
+    def test_tracing(self):
+        class Order(metaclass=kisa.Class, trace=1.0):
+            total = kisa.Info(type=int, default=0)
+
+            def add(self, amount):
+                self.total(self.total() + amount)
+                return self.checkout() if amount > 10 else None
+
+            def checkout(self):
+                raise Exception("Out of stock")
+
+            @kisa.before("add")
+            def validate(self, attr_name, amount):
+                pass
+
+        class Cart(metaclass=kisa.Class, trace={"total": 1.0, "clear": 0.0}):
+            total = kisa.Info(type=int, default=0)
+
+            def clear(self):
+                self.total(0)
+
+        exporter = kisa.MemoryExporter(size=100)
+        kisa.configure_tracing(exporter)
+        try:
+            order = Order()
+            order.add(1)
+            with self.assertRaises(Exception):
+                order.add(20)
+            cart = Cart()
+            cart.clear()
+        finally:
+            kisa.configure_tracing(None)
+        order.add(2)
+
+        spans = exporter.spans()
+        self.assertEqual([(span["name"], span["kind"]) for span in spans[:4]],
+                         [("Order.__init__", "method"),
+                          ("Order.add", "before"),
+                          ("Order.add", "call"),
+                          ("Order.add", "method")])
+        add_span = spans[3]
+        self.assertIsNone(add_span["parent_id"])
+        self.assertEqual(spans[2]["parent_id"], add_span["span_id"])
+        self.assertEqual(spans[1]["modifier"], "validate")
+        self.assertGreaterEqual(add_span["duration"], spans[2]["duration"])
+
+        checkout_span = spans[5]
+        self.assertEqual(checkout_span["name"], "Order.checkout")
+        self.assertIn("Out of stock", checkout_span["error"])
+        self.assertEqual(checkout_span["parent_id"], spans[6]["span_id"])
+        self.assertEqual(checkout_span["trace_id"], spans[7]["span_id"])
+
+        # Only the sampled Cart.total calls of the constructor, Cart.clear is never sampled
+        self.assertEqual([span["name"] for span in spans[8:]], ["Cart.total"])
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "spans.jsonl")
+            exporter = kisa.JsonlExporter(path)
+            kisa.configure_tracing(exporter)
+            try:
+                order.add(3)
+            finally:
+                kisa.configure_tracing(None)
+                exporter.close()
+            with open(path) as spans_file:
+                self.assertEqual(len(spans_file.readlines()), 3)
+
+        with self.assertRaises(Exception):
+            class Invalid(metaclass=kisa.Class, trace=2):
+                pass
+
+    def test_stream_attributes(self):
+        class LogFile(metaclass=kisa.Class):
+            path = kisa.Info(type=str)
+            content = kisa.StreamInfo(default=lambda self: self.path(), chunk_size=4)
+            lines = kisa.StreamInfo(default=lambda self: self.read_lines())
+            data = kisa.StreamInfo()
+
+            def read_lines(self):
+                with open(self.path()) as log_file:
+                    for line in log_file:
+                        yield line.rstrip()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "app.log")
+            with open(path, "w") as log_file:
+                log_file.write("first\nsecond\n")
+
+            log = LogFile(path=path, data=kisa.Stream(b"abcdef", chunk_size=4))
+            chunks = [bytes(chunk) for chunk in log.content()]
+            self.assertEqual(chunks, [b"firs", b"t\nse", b"cond", b"\n"])
+            self.assertEqual(b"".join(log.content()), b"first\nsecond\n")
+            self.assertEqual(log.content().size(), 13)
+            self.assertIsNone(log.lines().size())
+            self.assertEqual(list(log.lines()), ["first", "second"])
+            self.assertEqual(list(log.lines()), ["first", "second"])
+            self.assertEqual([bytes(chunk) for chunk in log.data()], [b"abcd", b"ef"])
+
+            mapping = log.content()._mapping
+            del chunks, log
+            self.assertTrue(mapping.closed)
+
+        with self.assertRaises(Exception):
+            kisa.Stream(1)
+        with self.assertRaises(Exception):
+            LogFile(path=path, data=b"abc")
+
+    def test_evictable_lazy_attributes(self):
+        class Report(metaclass=kisa.Class):
+            name = kisa.Info(type=str)
+            content = kisa.Info(type=str, lazy=True, evictable=True, default=lambda self: self.render())
+
+            def render(self):
+                rendered.append(self.name())
+                return self.name() * 100
+
+        rendered = []
+        kisa.configure_lazy_cache(max_entries=2)
+        try:
+            reports = [Report(name=name) for name in "abc"]
+            for report in reports:
+                report.content()
+            reports[1].content()
+            self.assertEqual(rendered, ["a", "b", "c"])
+            self.assertEqual(kisa.lazy_cache_stats()["entries"], 2)
+
+            # "a" was evicted, and is computed again
+            self.assertEqual(reports[0].content(), "a" * 100)
+            self.assertEqual(rendered, ["a", "b", "c", "a"])
+            # "c" is the least recently used, "b" was read after it
+            reports[1].content()
+            self.assertEqual(rendered, ["a", "b", "c", "a"])
+            reports[2].content()
+            self.assertEqual(rendered, ["a", "b", "c", "a", "c"])
+
+            # Set values aren't evictable
+            reports[0].content("set")
+            Report(name="d").content()
+            Report(name="e").content()
+            self.assertEqual(reports[0].content(), "set")
+
+            kisa.configure_lazy_cache(max_entries=None, max_bytes=1)
+            self.assertEqual(kisa.lazy_cache_stats()["entries"], 1)
+        finally:
+            kisa.configure_lazy_cache()
+
+        class Batch(metaclass=kisa.Class, pool_size=4):
+            size = kisa.Info(type=int)
+            rows = kisa.Info(type=list, lazy=True, evictable=True, default=lambda self: ["x" * 10] * self.size())
+
+        # NOTE: A custom sizeof counts the referenced objects as well
+        kisa.configure_lazy_cache(max_entries=None, max_bytes=1000, sizeof=lambda rows: 10 * len(rows))
+        try:
+            batches = [Batch(size=40) for _ in range(3)]
+            for batch in batches:
+                batch.rows()
+            self.assertEqual(kisa.lazy_cache_stats()["bytes"], 800)
+
+            # Released instances are reset, so their values are removed from the cache
+            kisa.release(batches[2])
+            self.assertEqual(kisa.lazy_cache_stats()["bytes"], 400)
+            self.assertEqual(kisa.lazy_cache_stats()["entries"], 1)
+        finally:
+            kisa.configure_lazy_cache()
+
+        with self.assertRaises(Exception):
+            kisa.Info(type=str, evictable=True)
+        with self.assertRaises(Exception):
+            kisa.Info(type=str, lazy=True, evictable=True, final=True)
+
+    def test_evictable_lazy_attributes_copies(self):
+        class Report(metaclass=kisa.Class):
+            name = kisa.Info(type=str)
+            content = kisa.Info(type=str, lazy=True, evictable=True, default=lambda self: self.name() * 100)
+
+        kisa.configure_lazy_cache(max_entries=None)
+        try:
+            entries = kisa.lazy_cache_stats()["entries"]
+            report = Report(name="a")
+            report.content()
+            # Copied values computed from default are counted (and evicted) as well
+            evolved = kisa.evolve(report, name="b")
+            copied = copy.copy(report)
+            self.assertEqual(kisa.lazy_cache_stats()["entries"], entries + 3)
+            self.assertEqual((evolved.content(), copied.content()), ("a" * 100, "a" * 100))
+
+            # Set values aren't evictable
+            changed = kisa.evolve(report, content="set")
+            self.assertEqual(kisa.lazy_cache_stats()["entries"], entries + 3)
+            kisa.configure_lazy_cache(max_entries=1)
+            self.assertEqual(changed.content(), "set")
+        finally:
+            kisa.configure_lazy_cache()
+
+    def test_prefetch(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        class Page(metaclass=kisa.Class, track_changes=True):
+            url = kisa.Info(type=str)
+            content = kisa.Info(type=str, lazy=True, default=lambda self: self.fetch())
+
+            def fetch(self):
+                # NOTE: Passes only if all of the pages are fetched concurrently
+                barrier.wait()
+                return f"<{self.url()}>"
+
+        pages = [Page(url=url) for url in "abc"]
+        self.assertEqual(kisa.prefetch(pages + pages[:1], "content"), 3)
+        self.assertEqual([page.content() for page in pages], ["<a>", "<b>", "<c>"])
+        self.assertEqual(kisa.changed_fields(pages[0]), frozenset())
+        self.assertEqual(kisa.prefetch(pages, "content"), 0)
+
+        with self.assertRaises(Exception):
+            kisa.prefetch(pages, "url")
+
+        async def fetch_async(self):
+            await asyncio.sleep(0)
+            return self.url().upper()
+
+        class AsyncPage(metaclass=kisa.Class):
+            url = kisa.Info(type=str)
+            content = kisa.Info(type=str, lazy=True, default=fetch_async)
+            title = kisa.Info(type=str, lazy=True, default=lambda self: self.url() * 2)
+
+        async_pages = [AsyncPage(url=url) for url in "ab"]
+        self.assertEqual(asyncio.run(kisa.prefetch_async(async_pages, "content", max_concurrency=1)), 2)
+        self.assertEqual(asyncio.run(kisa.prefetch_async(async_pages, "title")), 2)
+        self.assertEqual([(page.content(), page.title()) for page in async_pages], [("A", "aa"), ("B", "bb")])
+
+    def test_make_class(self):
+        schemas = {"__name__": "schemas"}
+        Node = kisa.make_class("Node",
+                               fields={"value": int,
+                                       "next": kisa.Info(type="Node", required=False),
+                                       "children": {"type": List["Node"], "default": lambda: []},
+                                       "tag": "Tag"},
+                               methods={"double": lambda self: self.value() * 2},
+                               module=schemas,
+                               eq=True)
+        # NOTE: String types are resolved lazily, so the namespace may be filled later
+        schemas["Tag"] = kisa.make_class("Tag", fields={"label": str}, module=schemas)
+        Tag = schemas["Tag"]
+
+        node = Node(value=2, tag=Tag(label="a"), next=Node(value=1, tag=Tag(label="b")))
+        self.assertEqual((Node.__module__, Node.__qualname__), ("schemas", "Node"))
+        self.assertEqual(node.double(), 4)
+        self.assertEqual(node.next().value(), 1)
+        self.assertEqual(node.children([node.next()])[0].value(), 1)
+        with self.assertRaises(Exception):
+            node.children([1])
+        self.assertNotIn("Node", schemas)
+        self.assertEqual(Node(value=2, tag=node.tag()), Node(value=2, tag=node.tag()))
+        with self.assertRaises(Exception):
+            Node(value=1, tag="a")
+        with self.assertRaises(Exception):
+            Node(value=1)
+
+        events = []
+        Shape = kisa.make_class("Shape", metaclass=kisa.AbstractClass, methods={"area": kisa.abstract(None)})
+        Square = kisa.make_class("Square",
+                                 extends=Shape,
+                                 fields={"size": int},
+                                 methods={"area": lambda self: self.size() ** 2},
+                                 modifiers=[kisa.after("area")(lambda self, attr_name: events.append(attr_name))])
+        self.assertEqual(Square(size=3).area(), 9)
+        self.assertEqual(events, ["area"])
+        with self.assertRaises(Exception):
+            kisa.make_class("Circle", extends=Shape, fields={"radius": int})
+        with self.assertRaises(Exception):
+            kisa.make_class("Bad", fields={"not valid": int})
+
     def test_static_allow_none(self):
         class ClassStatic(metaclass=kisa.Class):
             name_static = kisa.StaticInfo(type=str, allow_none=True)
@@ -588,6 +1211,550 @@ class KisaUnitTests(unittest.TestCase):
         a = A(d=4, e=5)
         self.assertEqual(a.abcde_sum(), 15)
 
+    def test_singleton(self):
+        class Logger(metaclass=kisa.Class, singleton=True):
+            name = kisa.Info(type=str, default="Logger")
+
+        l1 = Logger(name="NoamLogger")
+        l2 = Logger()
+
+        self.assertIs(l1, l2)
+        self.assertEqual(l2.name(), "NoamLogger")
+
+    def test_singleton_threads(self):
+        constructed = 0
+
+        class Config(metaclass=kisa.Class, singleton=True):
+            @kisa.after("__init__")
+            def count_init(self_obj, attr_name, *args, **kwargs):
+                nonlocal constructed
+                constructed += 1
+
+        instances = []
+        threads = [threading.Thread(target=lambda: instances.append(Config()))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(constructed, 1)
+        self.assertEqual(len(set(map(id, instances))), 1)
+
+    def test_multiton(self):
+        class Connection(metaclass=kisa.Class, multiton_key="host"):
+            host = kisa.Info(type=str)
+            port = kisa.Info(type=int, default=80)
+
+        c1 = Connection(host="a", port=1)
+        c2 = Connection(host="b")
+
+        self.assertIsNot(c1, c2)
+        self.assertIs(Connection(host="a"), c1)
+        self.assertEqual(Connection(host="a").port(), 1)
+
+        try:
+            Connection(port=2)
+            self.fail("Multiton key must be passed to the constructor")
+        except AssertionError:
+            raise
+        except Exception:
+            pass
+
+    def test_final_per_instance(self):
+        class Person(metaclass=kisa.Class):
+            name = kisa.Info(type=str, final=True)
+
+        p1 = Person(name="Noam")
+        p2 = Person(name="Nisanov")
+        self.assertEqual(p1.name(), "Noam")
+        self.assertEqual(p2.name(), "Nisanov")
+
+    def test_pool(self):
+        class Request(metaclass=kisa.Class, pool_size=1):
+            path = kisa.Info(type=str, final=True)
+            headers = kisa.Info(type=dict, default=lambda: {})
+
+        r1 = Request(path="/a")
+        r1.headers()["X"] = "1"
+        kisa.release(r1)
+
+        r2 = Request(path="/b")
+        self.assertIs(r1, r2)
+        self.assertEqual(r2.path(), "/b")
+        self.assertEqual(r2.headers(), {})
+
+        r3 = Request(path="/c")
+        self.assertIsNot(r3, r2)
+
+        kisa.release(r2)
+        kisa.release(r3)
+
+        try:
+            kisa.release(r2)
+            self.fail("Instance can't be released twice")
+        except AssertionError:
+            raise
+        except Exception:
+            pass
+
+        self.assertEqual(kisa.pool_stats(Request), {"size": 1,
+                                                    "available": 1,
+                                                    "hits": 1,
+                                                    "misses": 2,
+                                                    "discarded": 1})
+
+    def test_frozen(self):
+        class Point(metaclass=kisa.Class, frozen=True):
+            x = kisa.Info(type=int)
+            y = kisa.Info(type=int, default=0)
+
+            @kisa.setter("x")
+            def set_x(self, val):
+                return abs(val)
+
+        p1 = Point(x=-1, y=2)
+        p2 = Point(x=1, y=2)
+
+        self.assertEqual(p1.x(), 1)
+        self.assertIsNot(p1, p2)
+        self.assertEqual(p1, p2)
+        self.assertEqual(hash(p1), hash(p2))
+        self.assertNotEqual(p1, Point(x=1))
+        self.assertEqual(len({p1, p2}), 1)
+
+        try:
+            p1.x(5)
+            self.fail("Frozen attribute was modified")
+        except AssertionError:
+            raise
+        except Exception:
+            pass
+        self.assertEqual(p1.x(), 1)
+
+    def test_frozen_inheritance(self):
+        class Vehicle(metaclass=kisa.Class):
+            wheels_amount = kisa.Info(type=int)
+
+        class FrozenVehicle(metaclass=kisa.Class, frozen=True):
+            wheels_amount = kisa.Info(type=int)
+
+        for extends, frozen in ((Vehicle, True), (FrozenVehicle, False)):
+            Car = None
+            try:
+                class Car(metaclass=kisa.Class, extends=extends, frozen=frozen):
+                    pass
+            except Exception:
+                pass
+            self.assertEqual(Car, None)
+
+        class FrozenCar(metaclass=kisa.Class, extends=FrozenVehicle, frozen=True):
+            color = kisa.Info(type=str)
+
+        self.assertEqual(FrozenCar(wheels_amount=4, color="red"),
+                         FrozenCar(wheels_amount=4, color="red"))
+        self.assertNotEqual(FrozenCar(wheels_amount=4, color="red"),
+                            FrozenCar(wheels_amount=3, color="red"))
+
+    def test_intern(self):
+        class Currency(metaclass=kisa.Class, frozen=True, intern=True):
+            code = kisa.Info(type=str)
+            digits = kisa.Info(type=int, default=2)
+
+        usd = Currency(code="USD")
+        self.assertIs(Currency(code="USD", digits=2), usd)
+        self.assertIsNot(Currency(code="USD", digits=3), usd)
+        self.assertIsNot(Currency(code="EUR"), usd)
+
+    def test_evolve(self):
+        class Person(metaclass=kisa.Class):
+            firstname = kisa.Info(type=str, final=True)
+            lastname = kisa.Info(type=str, final=True)
+            age = kisa.Info(type=int, allow_none=False)
+
+        p1 = Person(firstname="Noam", lastname="Nisanov", age=22)
+        p2 = kisa.evolve(p1, age=23)
+
+        self.assertEqual(p1.age(), 22)
+        self.assertEqual(p2.age(), 23)
+        self.assertEqual(p2.firstname(), "Noam")
+
+        p3 = kisa.evolve(p2, firstname="Dani")
+        self.assertEqual(p3.firstname(), "Dani")
+        self.assertEqual(p2.firstname(), "Noam")
+
+        for changes in ({"age": None}, {"unknown": 1}):
+            try:
+                kisa.evolve(p1, **changes)
+                self.fail(f"Invalid evolve changes: {changes}")
+            except AssertionError:
+                raise
+            except Exception:
+                pass
+
+    def test_evolve_frozen(self):
+        class Vehicle(metaclass=kisa.Class, frozen=True):
+            wheels_amount = kisa.Info(type=int)
+
+        class Car(metaclass=kisa.Class, extends=Vehicle, frozen=True):
+            color = kisa.Info(type=str)
+
+        car = Car(wheels_amount=4, color="red")
+        self.assertEqual(kisa.evolve(car, color="blue"),
+                         Car(wheels_amount=4, color="blue"))
+        self.assertEqual(kisa.evolve(car, wheels_amount=3).wheels_amount(), 3)
+        self.assertEqual(car.wheels_amount(), 4)
+
+        class Currency(metaclass=kisa.Class, frozen=True, intern=True):
+            code = kisa.Info(type=str)
+
+        self.assertIs(kisa.evolve(Currency(code="USD"), code="EUR"),
+                      Currency(code="EUR"))
+
+    def test_track_changes(self):
+        class Person(metaclass=kisa.Class, track_changes=True):
+            name = kisa.Info(type=str)
+            age = kisa.Info(type=int, default=0)
+            nickname = kisa.Info(type=str, default=lambda self: self.name(), lazy=True)
+
+        class Employee(metaclass=kisa.Class, extends=Person):
+            salary = kisa.Info(type=int, default=0)
+
+        flushed = []
+        kisa.observe_changes(Person, lambda obj, changed: flushed.append((obj, changed)))
+
+        employee = Employee(name="Noam")
+        self.assertEqual(kisa.changed_fields(employee), set())
+
+        self.assertEqual(employee.nickname(), "Noam")
+        self.assertEqual(kisa.changed_fields(employee), set())
+
+        employee.age(22)
+        employee.salary(10)
+        employee.age(23)
+        self.assertEqual(kisa.changed_fields(employee), {"age", "salary"})
+
+        self.assertEqual(kisa.flush_changes(employee), {"age", "salary"})
+        self.assertEqual(flushed, [(employee, {"age", "salary"})])
+        self.assertEqual(kisa.changed_fields(employee), set())
+
+        self.assertEqual(kisa.flush_changes(employee), set())
+        self.assertEqual(len(flushed), 1)
+
+        employee.name("Nisanov")
+        kisa.clear_changes(employee)
+        self.assertEqual(kisa.changed_fields(employee), set())
+
+    def test_computed(self):
+        computed = []
+
+        class Rectangle(metaclass=kisa.Class):
+            a = kisa.Info(type=int)
+            b = kisa.Info(type=int)
+            color = kisa.Info(type=str, default="red")
+
+            def compute_area(self):
+                computed.append("area")
+                return self.a() * self.b()
+
+            area = kisa.ComputedInfo(type=int, default=lambda self: self.compute_area())
+            double_area = kisa.ComputedInfo(type=int, default=lambda self: self.area() * 2)
+
+        r = Rectangle(a=2, b=3)
+        self.assertEqual(computed, [])
+        self.assertEqual(r.double_area(), 12)
+        self.assertEqual(r.area(), 6)
+        self.assertEqual(computed, ["area"])
+
+        r.color("blue")
+        self.assertEqual(r.double_area(), 12)
+        self.assertEqual(computed, ["area"])
+
+        r.b(4)
+        self.assertEqual(r.double_area(), 16)
+        self.assertEqual(computed, ["area", "area"])
+
+        for action in (lambda: r.area(1), lambda: Rectangle(a=1, b=1, area=1)):
+            try:
+                action()
+                self.fail("Computed attribute can't be set")
+            except AssertionError:
+                raise
+            except Exception:
+                pass
+
+    def test_memoize(self):
+        calls = []
+
+        class Circle(metaclass=kisa.Class):
+            radius = kisa.Info(type=int)
+
+            @kisa.memoize(maxsize=2)
+            def scaled_area(self, scale, offset=0):
+                calls.append(scale)
+                return self.radius() * self.radius() * scale + offset
+
+            @kisa.around("scaled_area")
+            def double(self_obj, attr_name, next, *args, **kwargs):
+                return next(*args, **kwargs) * 2
+
+        c1 = Circle(radius=2)
+        c2 = Circle(radius=3)
+
+        self.assertEqual(c1.scaled_area(1), 8)
+        self.assertEqual(c1.scaled_area(1), 8)
+        self.assertEqual(c1.scaled_area(1, offset=1), 10)
+        self.assertEqual(c2.scaled_area(1), 18)
+        self.assertEqual(calls, [1, 1, 1])
+
+        c1.scaled_area(2)
+        c1.scaled_area(3)
+        c1.scaled_area(1)
+        self.assertEqual(calls, [1, 1, 1, 2, 3, 1])
+
+        c1.radius(1)
+        self.assertEqual(c1.scaled_area(3), 6)
+        self.assertEqual(calls, [1, 1, 1, 2, 3, 1, 3])
+
+        self.assertEqual(kisa.memoize_stats(Circle, "scaled_area"), {"maxsize": 2,
+                                                                     "hits": 1,
+                                                                     "misses": 7,
+                                                                     "hit_ratio": 1 / 8})
+
+    def assert_invalid_value(self, accessor, value):
+        try:
+            accessor(value)
+        except Exception:
+            return
+        self.fail(f"Value should be invalid: {value}")
+
+    def test_generic_types(self):
+        class Registry(metaclass=kisa.Class):
+            ids = kisa.Info(type=List[int], default=lambda: [])
+            names = kisa.Info(type=Dict[str, List[int]], default=lambda: {})
+            parent = kisa.Info(type=Optional["Registry"], allow_none=False, required=False)
+            point = kisa.Info(type=Tuple[int, str], default=(0, ""))
+            key = kisa.Info(type=Union[int, str], default=0)
+
+        registry = Registry()
+        self.assertEqual(registry.ids([1, 2]), [1, 2])
+        self.assert_invalid_value(registry.ids, [1, "2"])
+        self.assert_invalid_value(registry.ids, (1, 2))
+
+        self.assertEqual(registry.names({"a": [1]}), {"a": [1]})
+        self.assert_invalid_value(registry.names, {"a": ["1"]})
+        self.assert_invalid_value(registry.names, {1: [1]})
+
+        self.assertEqual(registry.parent(Registry()).parent(), None)
+        self.assert_invalid_value(registry.parent, 1)
+
+        self.assertEqual(registry.point((1, "a")), (1, "a"))
+        self.assert_invalid_value(registry.point, (1, 2))
+        self.assert_invalid_value(registry.point, (1, "a", 2))
+
+        self.assertEqual(registry.key("a"), "a")
+        self.assert_invalid_value(registry.key, 1.5)
+
+    def test_generic_types_check_policy(self):
+        class Samples(metaclass=kisa.Class):
+            sampled = kisa.Info(type=List[int], check_items=2, default=lambda: [])
+            unchecked = kisa.Info(type=List[int], check_items="none", default=lambda: [])
+            shallow = kisa.Info(type=List[List[int]], check_depth=1, default=lambda: [])
+
+        samples = Samples()
+        self.assertEqual(samples.sampled([1, 2, "3"]), [1, 2, "3"])
+        self.assert_invalid_value(samples.sampled, [1, "2", 3])
+        self.assert_invalid_value(samples.sampled, {1, 2})
+
+        self.assertEqual(samples.unchecked(["1"]), ["1"])
+        self.assert_invalid_value(samples.unchecked, ("1",))
+
+        self.assertEqual(samples.shallow([["1"]]), [["1"]])
+        self.assert_invalid_value(samples.shallow, [1])
+
+    def test_invalid_type_fails_on_class_creation(self):
+        for invalid_type in (5, ClassVar[int]):
+            with self.assertRaises(Exception):
+                class Invalid(metaclass=kisa.Class):
+                    value = kisa.Info(type=invalid_type, default=None)
+
+    def test_validation_modes(self):
+        for validation in ("full", "construct", "off"):
+            class Person(metaclass=kisa.Class, validation=validation):
+                name = kisa.Info(type=str)
+                age = kisa.Info(type=int, default=lambda: "unknown", lazy=True)
+
+            if validation == "off":
+                self.assertEqual(Person(name=1).name(), 1)
+                self.assertEqual(Person(name="Noam").age(), "unknown")
+            else:
+                self.assert_invalid_value(lambda name: Person(name=name), 1)
+                self.assert_invalid_value(lambda _: Person(name="Noam").age(), None)
+
+            person = Person(name="Noam")
+            if validation == "full":
+                self.assert_invalid_value(person.name, 1)
+            else:
+                self.assertEqual(person.name(1), 1)
+
+            self.assertEqual(Person.from_trusted(name=2).name(), 2)
+
+    def test_validation_mode_process(self):
+        kisa.set_validation_mode("off")
+        try:
+            class Person(metaclass=kisa.Class):
+                name = kisa.Info(type=str)
+        finally:
+            kisa.set_validation_mode("full")
+
+        class Employee(metaclass=kisa.Class, extends=Person):
+            salary = kisa.Info(type=int)
+
+        employee = Employee(name=1, salary=2)
+        self.assertEqual(employee.name(), 1)
+        self.assert_invalid_value(lambda salary: Employee(name=1, salary=salary), "2")
+        self.assertEqual(Employee.from_trusted(name=1, salary="2").salary(), "2")
+
+        try:
+            kisa.set_validation_mode("unknown")
+            self.fail("Unknown validation mode")
+        except AssertionError:
+            raise
+        except Exception:
+            pass
+
+    def test_import_lazy_dependencies(self):
+        # NOTE: typing is imported beforehand, since on some versions it imports re itself
+        code = "import sys, typing; before = set(sys.modules); import kisa; " \
+               "print(sorted({'re', 'inspect', 'pydoc', 'random', 'bisect'} & (set(sys.modules) - before)))"
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.path.dirname(kisa.__file__)
+        output = subprocess.check_output([sys.executable, "-c", code],
+                                         env=env,
+                                         universal_newlines=True)
+        self.assertEqual(output.strip(), "[]")
+
+    def test_deferred_after(self):
+        release_hook = threading.Event()
+        calls = []
+
+        class Logger(metaclass=kisa.Class):
+            level = kisa.Info(type=str)
+
+            @kisa.after("level", deferred=True)
+            def write_log(self, attr_name, *args):
+                release_hook.wait()
+                calls.append((attr_name, args, threading.current_thread() is not main_thread))
+
+        main_thread = threading.current_thread()
+        logger = Logger(level="info")
+        self.assertEqual(logger.level("warn"), "warn")
+        # Not run yet, the hook waits in the background
+        self.assertEqual(calls, [])
+
+        release_hook.set()
+        self.assertTrue(kisa.flush_deferred(timeout=5))
+        self.assertEqual(calls, [("level", ("info",), True), ("level", ("warn",), True)])
+
+    def test_deferred_after_overflow(self):
+        hook_started = threading.Event()
+        release_hook = threading.Event()
+        errors = []
+        kisa.configure_deferred(max_pending=1, overflow="drop", on_error=errors.append)
+        try:
+            class Task(metaclass=kisa.Class):
+                def run(self):
+                    pass
+
+                @kisa.after("run", deferred=True)
+                def on_run(self, attr_name):
+                    hook_started.set()
+                    release_hook.wait()
+                    raise ValueError("failed")
+
+            task = Task()
+            task.run()
+            # The worker runs the first call, one call is pending and the others are dropped
+            self.assertTrue(hook_started.wait(timeout=5))
+            for _ in range(3):
+                task.run()
+            release_hook.set()
+            self.assertTrue(kisa.flush_deferred(timeout=5))
+
+            self.assertEqual(kisa.deferred_stats(),
+                             {"pending": 0, "executed": 0, "dropped": 2, "failed": 2})
+            self.assertEqual(len(errors), 2)
+            self.assertIsInstance(errors[0], ValueError)
+        finally:
+            kisa.configure_deferred()
+
+    def test_deferred_reconfigure(self):
+        calls = []
+
+        class Job(metaclass=kisa.Class):
+            def run(self):
+                pass
+
+            @kisa.after("run", deferred=True)
+            def on_run(self, attr_name):
+                calls.append(attr_name)
+
+        for _ in range(3):
+            Job().run()
+            kisa.configure_deferred()
+        # Pending modifiers are run, and the previous workers are stopped
+        self.assertEqual(calls, ["run"] * 3)
+        self.assertEqual(len([thread for thread in threading.enumerate() if thread.name == "kisa-deferred"]), 0)
+
+        # A stuck modifier doesn't hang the exit
+        code = "import threading, kisa\n" \
+               "kisa.configure_deferred(exit_timeout=0.1)\n" \
+               "class Job(metaclass=kisa.Class):\n" \
+               "    def run(self):\n" \
+               "        pass\n" \
+               "    @kisa.after('run', deferred=True)\n" \
+               "    def on_run(self, attr_name):\n" \
+               "        threading.Event().wait()\n" \
+               "Job().run()\n"
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.path.dirname(kisa.__file__)
+        subprocess.run([sys.executable, "-c", code], env=env, timeout=30, check=True)
+
+    def test_compile_module(self):
+        from tests import compile_sample
+        source = kisa.compile_module(compile_sample)
+        self.assertNotIn("metaclass", source)
+        self.assertNotIn("import kisa", source)
+
+        compiled_sample = {"__name__": "compiled_sample"}
+        exec(compile(source, "compiled_sample.py", "exec"), compiled_sample)
+        self.assertEqual(compiled_sample["run_scenario"](),
+                         compile_sample.run_scenario())
+
+    def test_compile_module_unsupported(self):
+        with tempfile.TemporaryDirectory() as module_dir:
+            with open(os.path.join(module_dir, "kisa_compile_frozen.py"), "w") as module_file:
+                module_file.write("import kisa\n"
+                                  "class Point(metaclass=kisa.Class, frozen=True):\n"
+                                  "    x = kisa.Info(type=int)\n")
+            sys.path.insert(0, module_dir)
+            try:
+                module = importlib.import_module("kisa_compile_frozen")
+            finally:
+                sys.path.remove(module_dir)
+
+            with self.assertRaisesRegex(Exception, "can't be compiled, it uses frozen"):
+                kisa.compile_module(module)
+
+    def test_compile_command(self):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.path.dirname(kisa.__file__)
+        output = subprocess.check_output([sys.executable, "-m", "kisa", "compile", "tests.compile_sample"],
+                                         env=env,
+                                         universal_newlines=True)
+        from tests import compile_sample
+        self.assertEqual(output, kisa.compile_module(compile_sample))
+
 
 if __name__ == "__main__":
     unittest.main()